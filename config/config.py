@@ -40,10 +40,18 @@ class Config:
     VSCODE_STARTUP_DELAY = 5   # VS Code 啟動等待時間（秒）
     VSCODE_STARTUP_TIMEOUT = 9999999999999999999999999  # VS Code 啟動超時時間（秒）
     VSCODE_COMMAND_DELAY = 1    # 命令執行間隔時間（秒）
+    VSCODE_EXTENSION_SETTLE_DELAY = 3  # 視窗出現後等待擴充套件（Copilot Chat）載入的時間（秒）
     
     # ==================== Copilot Chat 相關設定 ====================
     COPILOT_RESPONSE_TIMEOUT = 9999999999999999999999999   # Copilot 回應超時時間（秒）
-    COPILOT_CHECK_INTERVAL = 3      # 檢查回應完成間隔（秒）
+    COPILOT_CHECK_INTERVAL = 1.5    # 檢查回應完成間隔（秒）
+    COPILOT_CHECK_INTERVAL_MIN = 0.5  # 自適應檢查間隔下限：剛開始等待或未偵測到 stop 按鈕時（秒）
+    COPILOT_CHECK_INTERVAL_MAX = 2.0  # 自適應檢查間隔上限：回應中逐步拉長至此（秒）
+    COPILOT_INITIAL_WAIT = 2.5      # 發送提示詞後開始檢測前的初始等待（秒）
+    COPILOT_CHAT_OPEN_DELAY = 1     # 開啟 Chat 面板後的等待時間（秒）
+    COPILOT_HOTKEY_GAP = 0.5        # 連續快捷鍵之間的間隔（秒）
+    COPILOT_MENU_OPEN = 0.5         # 開啟右鍵選單後的等待時間（秒）
+    COPILOT_COPY_FLUSH = 1          # 執行複製後等待剪貼簿寫入的時間（秒）
     COPILOT_COPY_RETRY_MAX = 3      # 複製回應重試次數
     COPILOT_COPY_RETRY_DELAY = 2    # 複製重試間隔（秒）
     
@@ -121,6 +121,16 @@ if [[ "$OSTYPE" == "linux-gnu"* ]]; then
         echo "✅ 檢測到 scrot"
     fi
     
+    # 檢查視窗偵測工具 (xdotool) - 開啟/關閉專案時偵測 VS Code 視窗，未安裝時改用固定等待
+    echo ""
+    echo "🔍 檢查視窗偵測工具 (xdotool)..."
+    if ! command -v xdotool &> /dev/null; then
+        echo "⚠️  未檢測到 xdotool (未安裝時開啟專案會固定等待 VS Code 啟動時間)"
+        MISSING_PACKAGES="$MISSING_PACKAGES xdotool"
+    else
+        echo "✅ 檢測到 xdotool"
+    fi
+    
     # 如果有缺少的套件，提示使用者安裝
     if [ -n "$MISSING_PACKAGES" ]; then
         echo ""
@@ -132,7 +142,7 @@ if [[ "$OSTYPE" == "linux-gnu"* ]]; then
         echo "  sudo apt-get update"
         echo "  sudo apt-get install -y$MISSING_PACKAGES"
         echo ""
-        echo "這些套件是 PyAutoGUI 截圖和剪貼簿功能正常運作所必需的。"
+        echo "這些套件是 PyAutoGUI 截圖、剪貼簿與 VS Code 視窗偵測功能正常運作所必需的。"
         echo ""
         read -p "是否現在嘗試安裝? (需要 sudo 權限) (y/N): " -n 1 -r
         echo
@@ -4,6 +4,7 @@ Hybrid UI Automation Script - 主控制腳本
 整合所有模組，實作完整的自動化流程控制
 """
 
+import os
 import time
 import sys
 from pathlib import Path
@@ -11,8 +12,9 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
 # 設定模組搜尋路徑
-sys.path.append(str(Path(__file__).parent))
-sys.path.append(str(Path(__file__).parent.parent))
+for _search_path in (str(Path(__file__).parent), str(Path(__file__).parent.parent)):
+    if _search_path not in sys.path:
+        sys.path.append(_search_path)
 
 # 導入所有模組
 from config.config import config
@@ -817,25 +819,33 @@ class HybridUIAutomationScript:
             total_files = 0
             round_dirs = []
             
-            if project_result_dir.exists():
-                round_dirs = [d for d in project_result_dir.iterdir() 
-                             if d.is_dir() and d.name.startswith('第') and d.name.endswith('輪')]
+            result_dir_exists = project_result_dir.is_dir()
+            
+            if result_dir_exists:
+                # 每個目錄只 scandir 一次，直接使用 DirEntry 的檔案類型，不再逐一 stat
+                def scan_dir(path):
+                    with os.scandir(path) as it:
+                        return list(it)
+                
+                round_dirs = [e for e in scan_dir(project_result_dir)
+                              if e.is_dir() and e.name.startswith('第') and e.name.endswith('輪')]
                 
                 for round_dir in round_dirs:
-                    phase_dirs = [d for d in round_dir.iterdir() 
-                                 if d.is_dir() and d.name.startswith('第') and d.name.endswith('道')]
+                    round_entries = scan_dir(round_dir.path)
+                    phase_dirs = [e for e in round_entries
+                                  if e.is_dir() and e.name.startswith('第') and e.name.endswith('道')]
                     
                     if phase_dirs:
                         for phase_dir in phase_dirs:
-                            files_in_phase = list(phase_dir.glob("*.md"))
-                            total_files += len(files_in_phase)
+                            total_files += sum(1 for e in scan_dir(phase_dir.path)
+                                               if e.name.endswith('.md') and e.is_file())
                     else:
-                        files_in_round = list(round_dir.glob("*.md"))
-                        total_files += len(files_in_round)
+                        total_files += sum(1 for e in round_entries
+                                           if e.name.endswith('.md') and e.is_file())
                 
                 has_success_file = len(round_dirs) > 0 and total_files > 0
             
-            self.logger.debug(f"結果檔案驗證 - 目錄存在: {project_result_dir.exists()}, "
+            self.logger.debug(f"結果檔案驗證 - 目錄存在: {result_dir_exists}, "
                               f"輪數資料夾: {len(round_dirs)}, 總檔案數: {total_files}")
             
             if not has_success_file:
@@ -976,9 +986,7 @@ class HybridUIAutomationScript:
             return success, files_processed
             
         except Exception as e:
-            self.logger.error(f"AS Mode 執行時發生錯誤: {e}")
-            import traceback
-            traceback.print_exc()
+            self.logger.error(f"AS Mode 執行時發生錯誤: {e}", exc_info=True)
             return False, 0
     
     def _build_execution_settings_for_report(self) -> dict:
@@ -16,6 +16,9 @@ from src.logger import get_logger
 from src.copilot_rate_limit_handler import is_response_incomplete, wait_and_retry
 from config.config import config
 
+# 模板目錄為固定路徑，模組載入時計算一次
+_TEMPLATE_DIR = Path(__file__).parent.parent / "assets" / "prompt-template"
+
 
 class ArtificialSuicideMode:
     """
@@ -120,7 +123,7 @@ class ArtificialSuicideMode:
     
     def _load_templates(self) -> Dict[str, str]:
         """載入三個 prompt 模板"""
-        template_dir = Path(__file__).parent.parent / "assets" / "prompt-template"
+        template_dir = _TEMPLATE_DIR
         templates = {}
         
         template_files = {
@@ -149,7 +152,7 @@ class ArtificialSuicideMode:
             self.logger.warning("⚠️  未指定目標 CWE，無法載入範例程式碼")
             return ""
         
-        cwe_example_dir = Path(__file__).parent.parent / "assets" / "prompt-template" / "CWE"
+        cwe_example_dir = _TEMPLATE_DIR / "CWE"
         cwe_example_file = cwe_example_dir / f"{cwe_id}.txt"
         
         try:
@@ -11,7 +11,6 @@ Key features:
 - Support for both AS Mode and Non-AS Mode workflows
 """
 
-import json
 import os
 from datetime import datetime
 from pathlib import Path
@@ -19,11 +18,16 @@ from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from src.logger import get_logger
+    from src.json_compat import load_json_file, write_json_file
 except ImportError:
     from logger import get_logger
+    from json_compat import load_json_file, write_json_file
 
 logger = get_logger("CheckpointManager")
 
+# Workspace root used for the default checkpoint/output/projects locations
+_WORKSPACE = Path(__file__).parent.parent
+
 
 class CheckpointManager:
     """
@@ -69,8 +73,7 @@ class CheckpointManager:
         """
         if base_dir is None:
             # Default to checkpoints directory in workspace
-            workspace = Path(__file__).parent.parent
-            base_dir = workspace / "checkpoints"
+            base_dir = _WORKSPACE / "checkpoints"
         
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
@@ -231,11 +234,8 @@ class CheckpointManager:
             return
         
         try:
-            # Write to temp file first, then rename (atomic operation)
-            temp_path = self.checkpoint_path.with_suffix('.tmp')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(self._current_checkpoint, f, ensure_ascii=False, indent=2)
-            temp_path.rename(self.checkpoint_path)
+            # Written to a temp file first, then swapped in atomically
+            write_json_file(self.checkpoint_path, self._current_checkpoint)
             
             logger.debug(f"檢查點已保存: 專案 {self._current_checkpoint['progress']['current_project_index']}, "
                         f"輪數 {self._current_checkpoint['progress']['current_round']}, "
@@ -256,8 +256,7 @@ class CheckpointManager:
             return None
         
         try:
-            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
-                checkpoint = json.load(f)
+            checkpoint = load_json_file(self.checkpoint_path)
             
             # Validate checkpoint version
             if checkpoint.get("version") != self.CHECKPOINT_VERSION:
@@ -361,14 +360,12 @@ class CheckpointManager:
             Dictionary with detected progress information
         """
         if output_base_dir is None:
-            workspace = Path(__file__).parent.parent
-            output_base_dir = workspace / "output" / "ExecutionResult" / "Success"
+            output_base_dir = _WORKSPACE / "output" / "ExecutionResult" / "Success"
         else:
             output_base_dir = Path(output_base_dir)
         
         if projects_dir is None:
-            workspace = Path(__file__).parent.parent
-            projects_dir = workspace / "projects"
+            projects_dir = _WORKSPACE / "projects"
         else:
             projects_dir = Path(projects_dir)
         
@@ -422,10 +419,12 @@ class CheckpointManager:
                         # Extract max line number from filenames (format: YYYYMMDD_HHMMSS_第N行.md)
                         max_line = 0
                         for f in files:
+                            _, sep, line_part = f.stem.partition("_第")
+                            if not sep:
+                                continue
                             try:
-                                line_part = f.stem.split("_第")[1].replace("行", "")
-                                max_line = max(max_line, int(line_part))
-                            except (IndexError, ValueError):
+                                max_line = max(max_line, int(line_part.replace("行", "")))
+                            except ValueError:
                                 pass
                         
                         # Check if this round is complete
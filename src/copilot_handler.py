@@ -8,14 +8,18 @@ Hybrid UI Automation Script - Copilot Chat 操作模組
 
 import pyautogui
 import pyperclip
-import psutil
+import os
+import re
 import time
+import mmap
 from pathlib import Path
 from typing import Optional, Tuple, List
 import sys
 
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 try:
     from config.config import config
 except ImportError:
@@ -28,6 +32,7 @@ except ImportError:
 try:
     from src.logger import get_logger
     from src.image_recognition import image_recognition
+    from src.vscode_controller import vscode_controller
     from src.copilot_rate_limit_handler import (
         is_response_incomplete,
         wait_and_retry
@@ -35,14 +40,34 @@ try:
 except ImportError:
     from logger import get_logger
     from image_recognition import image_recognition
+    from vscode_controller import vscode_controller
     from copilot_rate_limit_handler import (
         is_response_incomplete,
         wait_and_retry
     )
 
+# 回應檔案名稱格式：{時間戳記}_第N輪.md
+_RESPONSE_FILE_RE = re.compile(r'_第\d+輪\.md$')
+
+# 回應記錄檔中的回應區段標記（舊格式檔案僅有分隔線）
+_RESPONSE_MARKER = "## Copilot 回應\n\n".encode('utf-8')
+_LEGACY_SEPARATOR = ("=" * 50 + "\n\n").encode('utf-8')
+
+# 提示詞檔案快取：{檔案路徑: (修改時間, 內容)}，檔案未修改時不重複讀取
+_prompt_cache = {}
+
 class CopilotHandler:
     """Copilot Chat 操作處理器"""
     COMPLETION_INSTRUCTION = ''
+    
+    # 回應記錄檔的標頭模板
+    _HEADER_TMPL = (
+        "# Copilot 自動補全記錄\n"
+        "# 生成時間: {ts}\n"
+        "# 專案: {name}\n"
+        "# 專案路徑: {path}\n"
+        "# 互動輪數: 第 {round_number} 輪\n"
+    )
 
     def __init__(self, error_handler=None, interaction_settings=None, cwe_scan_manager=None, cwe_scan_settings=None, checkpoint_manager=None):
         """
@@ -66,6 +91,24 @@ class CopilotHandler:
         self.cwe_scan_settings = cwe_scan_settings  # CWE 掃描設定
         self.checkpoint_manager = checkpoint_manager  # 檢查點管理器
         self._clipboard_lock = False  # 剪貼簿鎖定狀態，避免併發衝突
+        self._clipboard_owned_content = None  # 最近一次由本處理器寫入並驗證的剪貼簿內容
+        
+        # 預先計算輸出根目錄，避免每次儲存重新組合路徑
+        self._script_root = Path(__file__).resolve().parent.parent
+        self._coding_instruction_path = self._script_root / "assets" / "prompt-template" / "coding_instruction.txt"
+        
+        # coding_instruction.txt 模板快取：(檔案 mtime_ns, 模板內容)，檔案未變更時不重新讀取
+        self._coding_instruction_cache = None
+        self._execution_result_dir = getattr(
+            config, "EXECUTION_RESULT_DIR", self._script_root / "output" / "ExecutionResult"
+        )
+        
+        # 本次執行已儲存的回應檔案索引：{專案名稱: {輪數: 第N輪資料夾中最新儲存的檔案}}
+        # 只記錄直接位於 Success/<專案>/第N輪/ 的檔案，與 _read_previous_round_response 的掃描範圍一致
+        self._round_files = {}
+        
+        # 最新回應檔案查詢快取：{專案名稱: (目錄 mtime_ns, 最新檔案路徑)}
+        self._latest_resp_cache = {}
         
         # Resume 狀態（用於從中斷點繼續執行）
         self.resume_round = 1  # 恢復起始輪數
@@ -256,6 +299,16 @@ class CopilotHandler:
         max_attempts = 3
         wait_time = 0.8
         
+        # 剪貼簿內容仍是上次自己寫入的相同內容時，只需確認一次即可，免去重新寫入與等待
+        if self._clipboard_owned_content is not None and self._clipboard_owned_content == content:
+            try:
+                if pyperclip.paste() == content:
+                    self.logger.debug(f"剪貼簿內容未變更，略過複製 - {context}")
+                    return True
+            except Exception:
+                pass
+            self._clipboard_owned_content = None
+        
         for attempt in range(max_attempts):
             try:
                 # 避免併發操作
@@ -275,6 +328,7 @@ class CopilotHandler:
                 self._clipboard_lock = False
                 
                 if copied_content == content:
+                    self._clipboard_owned_content = content
                     self.logger.debug(f"剪貼簿複製成功 - {context} (第 {attempt + 1} 次)")
                     return True
                 else:
@@ -308,7 +362,7 @@ class CopilotHandler:
             time.sleep(config.VSCODE_COMMAND_DELAY)
             
             # 等待面板開啟和聚焦
-            time.sleep(2)
+            time.sleep(config.COPILOT_CHAT_OPEN_DELAY)
             
             # 如果啟用模型切換功能，執行模型切換操作
             if config.COPILOT_SWITCH_MODEL_ON_START:
@@ -373,6 +427,7 @@ class CopilotHandler:
                     self.logger.error("無法讀取提示詞檔案")
                     return False
             
+            self.last_sent_prompt = prompt
             self.logger.info("發送提示詞到 Copilot Chat...")
             self.logger.debug(f"提示詞內容: {prompt[:100]}...")
             
@@ -383,17 +438,17 @@ class CopilotHandler:
             
             # 使用 Ctrl+F1 聚焦到輸入框
             pyautogui.hotkey('ctrl', 'f1')
-            time.sleep(1)
+            time.sleep(config.COPILOT_HOTKEY_GAP)
             
             # 清空現有內容並貼上提示詞
             pyautogui.hotkey('ctrl', 'a')  # 全選
             time.sleep(0.2)
             pyautogui.hotkey('ctrl', 'v')  # 貼上
-            time.sleep(1)
+            time.sleep(config.COPILOT_HOTKEY_GAP)
             
             # 發送提示詞
             pyautogui.press('enter')
-            time.sleep(1)
+            time.sleep(config.COPILOT_HOTKEY_GAP)
             
             self.is_chat_open = True
             self.logger.copilot_interaction("發送提示詞", "SUCCESS", f"長度: {len(prompt)} 字元")
@@ -420,8 +475,14 @@ class CopilotHandler:
             if not prompt_file_path.exists():
                 self.logger.error(f"提示詞檔案不存在: {prompt_file_path}")
                 return None
-            with open(prompt_file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
+            mtime = prompt_file_path.stat().st_mtime
+            cached = _prompt_cache.get(prompt_file_path)
+            if cached and cached[0] == mtime:
+                content = cached[1]
+            else:
+                with open(prompt_file_path, 'r', encoding='utf-8') as f:
+                    content = f.read().strip()
+                _prompt_cache[prompt_file_path] = (mtime, content)
             if not content:
                 self.logger.error("提示詞檔案為空")
                 return None
@@ -522,14 +583,19 @@ class CopilotHandler:
         """
         try:
             # 載入 coding_instruction.txt 模板
-            template_path = Path(__file__).parent.parent / "assets" / "prompt-template" / "coding_instruction.txt"
+            template_path = self._coding_instruction_path
             
-            if not template_path.exists():
+            try:
+                mtime_ns = template_path.stat().st_mtime_ns
+            except FileNotFoundError:
                 self.logger.error(f"找不到 coding_instruction.txt 模板: {template_path}")
                 return ""
             
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template = f.read()
+            # 每行 prompt 都會套用同一模板，僅在檔案變更時重新讀取
+            if self._coding_instruction_cache is None or self._coding_instruction_cache[0] != mtime_ns:
+                with open(template_path, 'r', encoding='utf-8') as f:
+                    self._coding_instruction_cache = (mtime_ns, f.read())
+            template = self._coding_instruction_cache[1]
             
             # 替換變數
             prompt = template.replace("{target_file}", filepath)
@@ -597,10 +663,14 @@ class CopilotHandler:
             self.logger.info(f"智能等待 Copilot 回應（純圖像識別），最長等待 {timeout} 秒...")
             
             start_time = time.time()
-            check_interval = 3.0  # 檢查間隔
+            # 自適應檢查間隔：回應中逐步拉長，未偵測到 stop 按鈕時回到最短間隔
+            min_interval = config.COPILOT_CHECK_INTERVAL_MIN
+            max_interval = config.COPILOT_CHECK_INTERVAL_MAX
+            check_interval = min_interval
+            last_report_bucket = 0  # 上次輸出進度時所在的 10 秒區間
             
             # 初始等待
-            initial_wait = 5
+            initial_wait = config.COPILOT_INITIAL_WAIT
             self.logger.info(f"初始等待 {initial_wait} 秒...")
             time.sleep(initial_wait)
             
@@ -629,12 +699,18 @@ class CopilotHandler:
                     # 檢測進行中：有 stop 按鈕
                     elif copilot_status['has_stop_button']:
                         self.logger.debug("🔄 檢測到 stop 按鈕，回應中...")
+                        check_interval = min(check_interval * 1.3, max_interval)
+                    
+                    else:
+                        check_interval = min_interval
                     
                 except Exception as e:
                     self.logger.debug(f"圖像檢測錯誤: {e}")
                 
-                # 每10秒報告一次
-                if int(elapsed_time) % 10 == 0 and int(elapsed_time) > 0:
+                # 每10秒報告一次（檢查間隔可能短於 1 秒，以 10 秒區間判斷避免同一時間點重複輸出）
+                report_bucket = int(elapsed_time) // 10
+                if report_bucket > last_report_bucket:
+                    last_report_bucket = report_bucket
                     try:
                         status = "回應中" if copilot_status.get('has_stop_button') else "檢測中"
                         self.logger.info(f"⏱️ 已等待 {int(elapsed_time)} 秒 (狀態: {status})")
@@ -674,15 +750,15 @@ class CopilotHandler:
                 # 使用鍵盤操作複製回應
                 # 1. Ctrl+F1 聚焦到 Copilot Chat 輸入框
                 pyautogui.hotkey('ctrl', 'f1')
-                time.sleep(1)
+                time.sleep(config.COPILOT_HOTKEY_GAP)
                 
                 # 2. Ctrl+↑ 聚焦到 Copilot 回應
                 pyautogui.hotkey('ctrl', 'up')
-                time.sleep(1)
+                time.sleep(config.COPILOT_HOTKEY_GAP)
                 
                 # 3. Shift+F10 開啟右鍵選單
                 pyautogui.hotkey('shift', 'f10')
-                time.sleep(1)
+                time.sleep(config.COPILOT_MENU_OPEN)
                 
                 # 4. 一次方向鍵下，定位到"複製"
                 pyautogui.press('down')
@@ -690,10 +766,11 @@ class CopilotHandler:
                 
                 # 5. Enter 執行複製
                 pyautogui.press('enter')
-                time.sleep(2)  # 增加等待時間確保複製完成
+                time.sleep(config.COPILOT_COPY_FLUSH)  # 等待剪貼簿寫入完成
                 
-                # 取得剪貼簿內容
+                # 取得剪貼簿內容（剪貼簿已由 Copilot 寫入，不再是自己寫入的內容）
                 response = pyperclip.paste()
+                self._clipboard_owned_content = response or ""
                 if response and len(response.strip()) > 0:
                     self.last_response = response
                     self.logger.copilot_interaction("複製回應", "SUCCESS", f"長度: {len(response)} 字元")
@@ -721,43 +798,6 @@ class CopilotHandler:
         self.logger.copilot_interaction("複製回應", "ERROR", f"重試 {config.COPILOT_COPY_RETRY_MAX} 次後仍然失敗")
         return None
     
-    def test_vscode_close_ready(self) -> bool:
-        """
-        測試 VS Code 是否可以關閉（檢測 Copilot 是否已完成回應）
-        
-        Returns:
-            bool: 如果可以關閉返回 True，否則返回 False
-        """
-        try:
-            self.logger.debug("測試 VS Code 是否可以關閉...")
-            
-            # 嘗試使用 Alt+F4 關閉視窗
-            pyautogui.hotkey('alt', 'f4')
-            time.sleep(1)
-            
-            # 檢查是否還有 VS Code 進程在運行（只檢查自動開啟的）
-            try:
-                from src.vscode_controller import vscode_controller
-            except ImportError:
-                from vscode_controller import vscode_controller
-            
-            still_running = []
-            for proc in psutil.process_iter(['pid', 'name']):
-                if ('code' in proc.info['name'].lower() and 
-                    proc.info['pid'] not in vscode_controller.pre_existing_vscode_pids):
-                    still_running.append(proc.info['pid'])
-            
-            if not still_running:
-                self.logger.debug("✅ VS Code 已成功關閉，Copilot 回應應該已完成")
-                return True
-            else:
-                self.logger.debug(f"⚠️ VS Code 仍在運行 (PID: {still_running})，可能 Copilot 仍在回應中")
-                return False
-                
-        except Exception as e:
-            self.logger.error(f"測試 VS Code 關閉狀態時發生錯誤: {str(e)}")
-            return False
-    
     def save_response_to_file(self, project_path: str, response: str = None, is_success: bool = True, **kwargs) -> bool:
         """
         將回應儲存到統一的 ExecutionResult 資料夾
@@ -772,6 +812,7 @@ class CopilotHandler:
                 - line_number: 行號
                 - filename: 檔案名稱（AS 模式專用）
                 - function_name: 函式名稱（AS 模式專用）
+                - project_name: 已計算好的專案名稱（省略時由 project_path 推得）
         
         Returns:
             bool: 儲存是否成功
@@ -784,41 +825,30 @@ class CopilotHandler:
                 self.logger.error("沒有可儲存的回應內容")
                 return False
             
-            project_dir = Path(project_path)
-            project_name = project_dir.name
+            project_name = kwargs.get('project_name') or os.path.basename(os.path.normpath(project_path))
             
-            # 使用 config 中定義的統一輸出目錄
-            try:
-                from config.config import config
-                execution_result_dir = config.EXECUTION_RESULT_DIR
-            except ImportError:
-                script_root = Path(__file__).parent.parent
-                execution_result_dir = script_root / "output" / "ExecutionResult"
-            
-            result_subdir = execution_result_dir / ("Success" if is_success else "Fail")
+            # 使用 config 中定義的統一輸出目錄（初始化時已計算）
+            result_subdir = self._execution_result_dir / ("Success" if is_success else "Fail")
             
-            # 建立專案專屬資料夾
+            # 專案專屬資料夾 / 輪數專屬資料夾
             project_subdir = result_subdir / project_name
-            project_subdir.mkdir(parents=True, exist_ok=True)
-            
-            # 建立輪數專屬資料夾
             round_number = kwargs.get('round_number', 1)
             round_subdir = project_subdir / f"第{round_number}輪"
-            round_subdir.mkdir(parents=True, exist_ok=True)
             
             # 檢查是否為 AS 模式（有 phase_number 參數）
             phase_number = kwargs.get('phase_number', None)
             if phase_number is not None:
                 # AS 模式：建立第N道資料夾
-                phase_subdir = round_subdir / f"第{phase_number}道"
-                phase_subdir.mkdir(parents=True, exist_ok=True)
-                output_dir = phase_subdir
+                output_dir = round_subdir / f"第{phase_number}道"
             else:
                 # 一般模式：直接在輪數資料夾下
                 output_dir = round_subdir
+            output_dir.mkdir(parents=True, exist_ok=True)
             
             # 生成檔名
-            timestamp = time.strftime('%Y%m%d_%H%M%S')
+            # 只取一次本地時間，檔名與標頭使用同一時間點
+            local_time = time.localtime()
+            timestamp = time.strftime('%Y%m%d_%H%M%S', local_time)
             line_number = kwargs.get('line_number', None)
             filename = kwargs.get('filename', None)
             function_name = kwargs.get('function_name', None)
@@ -842,65 +872,75 @@ class CopilotHandler:
             is_using_template = kwargs.get('is_using_template', False)  # 是否使用了模板
             has_response_chaining = kwargs.get('has_response_chaining', False)  # 是否有回應串接
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("# Copilot 自動補全記錄\n")
-                f.write(f"# 生成時間: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# 專案: {project_name}\n")
-                f.write(f"# 專案路徑: {project_path}\n")
-                f.write(f"# 互動輪數: 第 {round_number} 輪\n")
-                
-                # AS 模式：顯示道程序資訊
-                if phase_number is not None:
-                    phase_name = "Query Phase" if phase_number == 1 else "Coding Phase"
-                    f.write(f"# 道程序: 第 {phase_number} 道（{phase_name}）\n")
-                
-                # 如果有行號資訊，添加行號
-                if line_number is not None:
-                    total_lines = kwargs.get('total_lines', '?')
-                    f.write(f"# 提示詞行號: 第 {line_number}/{total_lines} 行\n")
-                
-                # AS 模式：顯示檔案和函式資訊
-                if filename and function_name:
-                    f.write(f"# 目標檔案: {filename}\n")
-                    f.write(f"# 目標函式: {function_name}\n")
-                
-                # 記錄重試信息
-                if retry_count > 0:
-                    f.write(f"# 重試次數: {retry_count}\n")
-                
-                f.write(f"# 執行狀態: {'成功' if is_success else '失敗'}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                # 添加原始提示詞
-                if line_number is not None:
-                    f.write(f"## 第 {line_number} 行原始提示詞\n\n")
+            # 先組合完整內容，再一次寫入檔案
+            parts = [self._HEADER_TMPL.format(
+                ts=time.strftime('%Y-%m-%d %H:%M:%S', local_time),
+                name=project_name,
+                path=project_path,
+                round_number=round_number
+            )]
+            
+            # AS 模式：顯示道程序資訊
+            if phase_number is not None:
+                phase_name = "Query Phase" if phase_number == 1 else "Coding Phase"
+                parts.append(f"# 道程序: 第 {phase_number} 道（{phase_name}）\n")
+            
+            # 如果有行號資訊，添加行號
+            if line_number is not None:
+                total_lines = kwargs.get('total_lines', '?')
+                parts.append(f"# 提示詞行號: 第 {line_number}/{total_lines} 行\n")
+            
+            # AS 模式：顯示檔案和函式資訊
+            if filename and function_name:
+                parts.append(f"# 目標檔案: {filename}\n")
+                parts.append(f"# 目標函式: {function_name}\n")
+            
+            # 記錄重試信息
+            if retry_count > 0:
+                parts.append(f"# 重試次數: {retry_count}\n")
+            
+            parts.append(f"# 執行狀態: {'成功' if is_success else '失敗'}\n")
+            parts.append("=" * 50 + "\n\n")
+            
+            # 添加原始提示詞
+            if line_number is not None:
+                parts.append(f"## 第 {line_number} 行原始提示詞\n\n")
+            else:
+                parts.append("## 本輪原始提示詞\n\n")
+            parts.append(prompt_text)
+            parts.append("\n\n")
+            
+            # 如果有實際發送的內容，也記錄下來
+            if actual_sent_prompt and actual_sent_prompt != prompt_text:
+                # 根據是否有回應串接來決定標題
+                if has_response_chaining:
+                    parts.append("## 實際發送內容（包含前面回應串接）\n\n")
                 else:
-                    f.write("## 本輪原始提示詞\n\n")
-                f.write(prompt_text)
-                f.write("\n\n")
+                    parts.append("## 實際發送內容\n\n")
                 
-                # 如果有實際發送的內容，也記錄下來
-                if actual_sent_prompt and actual_sent_prompt != prompt_text:
-                    # 根據是否有回應串接來決定標題
-                    if has_response_chaining:
-                        f.write("## 實際發送內容（包含前面回應串接）\n\n")
-                    else:
-                        f.write("## 實際發送內容\n\n")
-                    
-                    f.write(actual_sent_prompt)
-                    f.write("\n\n")
-                    
-                    # 根據情況顯示不同的說明
-                    if has_response_chaining:
-                        f.write(f"**注意**: 本次發送包含了前面回應的串接內容（啟用了「在新一輪提示詞中包含上一輪 Copilot 回應」選項），總長度: {len(actual_sent_prompt)} 字元\n\n")
-                    elif is_using_template:
-                        f.write(f"**注意**: 已套用 Coding Instruction 模板並加入完成指示標記，總長度: {len(actual_sent_prompt)} 字元\n\n")
-                    else:
-                        f.write(f"**注意**: 已加入完成指示標記 (COMPLETION_INSTRUCTION)，總長度: {len(actual_sent_prompt)} 字元\n\n")
+                parts.append(actual_sent_prompt)
+                parts.append("\n\n")
                 
-                # 添加回應內容
-                f.write("## Copilot 回應\n\n")
-                f.write(response)
+                # 根據情況顯示不同的說明
+                if has_response_chaining:
+                    parts.append(f"**注意**: 本次發送包含了前面回應的串接內容（啟用了「在新一輪提示詞中包含上一輪 Copilot 回應」選項），總長度: {len(actual_sent_prompt)} 字元\n\n")
+                elif is_using_template:
+                    parts.append(f"**注意**: 已套用 Coding Instruction 模板並加入完成指示標記，總長度: {len(actual_sent_prompt)} 字元\n\n")
+                else:
+                    parts.append(f"**注意**: 已加入完成指示標記 (COMPLETION_INSTRUCTION)，總長度: {len(actual_sent_prompt)} 字元\n\n")
+            
+            # 以二進位單次寫入：標頭一次編碼，回應區段標記沿用預先編碼的 _RESPONSE_MARKER，
+            # 換行固定為 \n，與 _extract_response_section 的位元組比對一致
+            output_file.write_bytes(b"".join((
+                "".join(parts).encode('utf-8'),
+                _RESPONSE_MARKER,
+                response.encode('utf-8'),
+            )))
+            
+            if is_success:
+                if phase_number is None:
+                    self._round_files.setdefault(project_name, {})[round_number] = output_file
+                self._latest_resp_cache.pop(project_name, None)
             
             self.logger.copilot_interaction("儲存回應", "SUCCESS", f"檔案: {output_file.name}")
             
@@ -1109,6 +1149,7 @@ class CopilotHandler:
                         # 準備儲存參數
                         save_kwargs = {
                             "project_path": project_path,
+                            "project_name": project_name,
                             "response": response,
                             "is_success": True,
                             "round_number": round_number,
@@ -1180,11 +1221,6 @@ class CopilotHandler:
                                 "copilot_chat_modification_action", "keep"
                             )
                         
-                        try:
-                            from src.vscode_controller import vscode_controller
-                        except ImportError:
-                            from vscode_controller import vscode_controller
-                        
                         self.logger.info(f"🧹 清除 Copilot 記憶 (第 {line_num} 行處理完成後，執行 {modification_action})...")
                         vscode_controller.clear_copilot_memory(modification_action)
                         time.sleep(1.5)  # 等待記憶清除完成
@@ -1254,12 +1290,6 @@ class CopilotHandler:
             Tuple[bool, int]: (處理是否成功, 實際處理的行數)
         """
         try:
-            # 導入config以確保作用域可訪問
-            try:
-                from config.config import config
-            except ImportError:
-                from config import config
-            
             project_name = Path(project_path).name
             
             # 檢查是否啟用多輪互動
@@ -1339,11 +1369,7 @@ class CopilotHandler:
             first_round_successful_lines = 0  # 只記錄第一輪的處理行數
             total_failed_lines = []
             
-            # 取得 vscode_controller 和 modification_action（在迴圈外取得避免重複導入）
-            try:
-                from src.vscode_controller import vscode_controller
-            except ImportError:
-                from vscode_controller import vscode_controller
+            # 取得 modification_action
             modification_action = interaction_settings.get(
                 "copilot_chat_modification_action", 
                 config.COPILOT_CHAT_MODIFICATION_ACTION
@@ -1481,7 +1507,7 @@ class CopilotHandler:
                 return False, 0
                 
             # 保存實際使用的提示詞，用於記錄
-            actual_prompt = custom_prompt or self._load_prompt_from_file(round_number)
+            actual_prompt = custom_prompt or self.last_sent_prompt
             
             # 步驟3: 等待回應 (使用指定的等待模式)
             if not self.wait_for_response(use_smart_wait=use_smart_wait):
@@ -1498,7 +1524,8 @@ class CopilotHandler:
                 response, 
                 is_success=True, 
                 round_number=round_number,
-                prompt_text=actual_prompt
+                prompt_text=actual_prompt,
+                project_name=project_name
             ):
                 return False, 0
             
@@ -1531,15 +1558,6 @@ class CopilotHandler:
         try:
             self.logger.info("清除 Copilot Chat 記錄...")
             # 使用控制器進行記憶清除，獲取設定參數
-            try:
-                from src.vscode_controller import vscode_controller
-            except ImportError:
-                from vscode_controller import vscode_controller
-            try:
-                from config.config import config
-            except ImportError:
-                from config import config
-            
             # 獲取修改結果處理設定
             modification_action = config.COPILOT_CHAT_MODIFICATION_ACTION
             if self.interaction_settings:
@@ -1582,45 +1600,72 @@ class CopilotHandler:
             Optional[str]: Copilot 回應內容，如果讀取失敗則返回 None
         """
         try:
-            project_name = Path(project_path).name
-            
-            # 使用 config 中定義的統一輸出目錄
-            try:
-                from config.config import config
-                execution_result_dir = config.EXECUTION_RESULT_DIR / "Success" / project_name
-            except ImportError:
-                script_root = Path(__file__).parent.parent
-                execution_result_dir = script_root / "output" / "ExecutionResult" / "Success" / project_name
-            
-            # 尋找該輪次的檔案（使用萬用字元匹配時間戳記）
-            pattern = f"*_第{round_number}輪.md"
-            matching_files = list(execution_result_dir.glob(pattern))
-            
-            if not matching_files:
-                self.logger.warning(f"找不到第 {round_number} 輪的回應檔案")
-                return None
+            project_name = os.path.basename(os.path.normpath(project_path))
             
-            # 取最新的檔案（如果有多個）
-            latest_file = max(matching_files, key=lambda x: x.stat().st_mtime)
+            # 優先使用本次執行儲存時記錄的檔案，避免重新掃描目錄
+            latest_file = self._round_files.get(project_name, {}).get(round_number)
             
-            # 讀取檔案內容並提取 Copilot 回應部分
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if latest_file is None or not latest_file.exists():
+                # 回應檔案儲存在 Success/<專案>/第N輪/ 之下
+                # （{時間戳記}_回應.md 或逐行模式的 {時間戳記}_第K行.md），取修改時間最新者
+                round_dir = self._execution_result_dir / "Success" / project_name / f"第{round_number}輪"
+                latest_entry = None
+                latest_mtime = None
+                try:
+                    with os.scandir(round_dir) as entries:
+                        for entry in entries:
+                            if not entry.name.endswith(".md") or not entry.is_file():
+                                continue
+                            mtime = entry.stat().st_mtime_ns
+                            if latest_mtime is None or mtime > latest_mtime:
+                                latest_entry, latest_mtime = entry, mtime
+                except FileNotFoundError:
+                    pass
+                
+                if latest_entry is None:
+                    self.logger.warning(f"找不到第 {round_number} 輪的回應檔案")
+                    return None
+                
+                latest_file = Path(latest_entry.path)
             
             # 提取 "## Copilot 回應" 之後的內容
-            response_marker = "## Copilot 回應\n\n"
-            if response_marker in content:
-                response_content = content.split(response_marker, 1)[1]
-                self.logger.debug(f"成功讀取第 {round_number} 輪回應內容 (長度: {len(response_content)} 字元)")
-                return response_content.strip()
-            else:
+            response_content = self._extract_response_section(latest_file)
+            if response_content is None:
                 self.logger.warning(f"在第 {round_number} 輪檔案中找不到回應標記")
                 return None
+            
+            self.logger.debug(f"成功讀取第 {round_number} 輪回應內容 (長度: {len(response_content)} 字元)")
+            return response_content.strip()
                 
         except Exception as e:
             self.logger.error(f"讀取第 {round_number} 輪回應時發生錯誤: {str(e)}")
             return None
     
+    def _extract_response_section(self, file_path: Path, allow_legacy: bool = False) -> Optional[str]:
+        """
+        以 mmap 搜尋回應標記，只解碼標記之後的內容
+        
+        Args:
+            file_path: 回應記錄檔路徑
+            allow_legacy: 找不到回應標記時是否改用舊格式的分隔線
+            
+        Returns:
+            Optional[str]: 回應內容，找不到標記則返回 None
+        """
+        if file_path.stat().st_size == 0:
+            return None
+        
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                marker = _RESPONSE_MARKER
+                idx = mm.find(marker)
+                if idx < 0 and allow_legacy:
+                    marker = _LEGACY_SEPARATOR
+                    idx = mm.find(marker)
+                if idx < 0:
+                    return None
+                return mm[idx + len(marker):].decode('utf-8')
+    
     def get_latest_response_file(self, project_path: str) -> Optional[Path]:
         """
         獲取指定專案的最新回應檔案
@@ -1632,27 +1677,33 @@ class CopilotHandler:
             Optional[Path]: 檔案路徑，若無檔案則返回 None
         """
         try:
-            project_name = Path(project_path).name
+            project_name = os.path.basename(os.path.normpath(project_path))
+            project_result_dir = self._execution_result_dir / "Success" / project_name
             
-            # 使用 config 中定義的統一輸出目錄
             try:
-                from config.config import config
-                project_result_dir = config.EXECUTION_RESULT_DIR / "Success" / project_name
-            except ImportError:
-                script_root = Path(__file__).parent.parent
-                project_result_dir = script_root / "output" / "ExecutionResult" / "Success" / project_name
-            
-            if not project_result_dir.exists():
+                dir_mtime = os.stat(project_result_dir).st_mtime_ns
+            except FileNotFoundError:
                 return None
             
-            # 找出所有回應檔案
-            response_files = list(project_result_dir.glob("*_第*輪.md"))
+            # 目錄未變動時直接沿用上次的查詢結果
+            cached = self._latest_resp_cache.get(project_name)
+            if cached and cached[0] == dir_mtime:
+                return cached[1]
+            
+            # 單次 scandir 找出最新的回應檔案（直接使用 DirEntry 的 stat 結果）
+            latest_path = None
+            latest_mtime = -1.0
+            with os.scandir(project_result_dir) as entries:
+                for entry in entries:
+                    if not _RESPONSE_FILE_RE.search(entry.name):
+                        continue
+                    mtime = entry.stat(follow_symlinks=False).st_mtime
+                    if mtime > latest_mtime:
+                        latest_mtime = mtime
+                        latest_path = entry.path
             
-            if not response_files:
-                return None
-                
-            # 根據修改時間排序，取最新的
-            latest_file = max(response_files, key=lambda f: f.stat().st_mtime)
+            latest_file = Path(latest_path) if latest_path else None
+            self._latest_resp_cache[project_name] = (dir_mtime, latest_file)
             return latest_file
             
         except Exception as e:
@@ -1674,23 +1725,8 @@ class CopilotHandler:
             if not latest_file:
                 return None
                 
-            # 讀取檔案內容
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # 提取 Copilot 回應部分
-            response_marker = "## Copilot 回應\n\n"
-            if response_marker in content:
-                response = content.split(response_marker)[1]
-                return response
-                
-            # 舊格式檔案處理
-            separator = "=" * 50 + "\n\n"
-            if separator in content:
-                response = content.split(separator)[1]
-                return response
-                
-            return None
+            # 提取 Copilot 回應部分（舊格式檔案以分隔線後的內容為回應）
+            return self._extract_response_section(latest_file, allow_legacy=True)
             
         except Exception as e:
             self.logger.error(f"讀取上一輪回應失敗: {str(e)}")
@@ -1703,12 +1739,6 @@ class CopilotHandler:
         Returns:
             dict: 互動設定字典
         """
-        # 導入config以確保作用域可訪問
-        try:
-            from config.config import config
-        except ImportError:
-            from config import config
-        
         # 優先使用外部設定（來自 UI）
         if self.interaction_settings is not None:
             self.logger.info(f"使用外部提供的互動設定: {self.interaction_settings}")
@@ -1750,12 +1780,6 @@ class CopilotHandler:
             Tuple[bool, int]: (處理是否成功, 實際處理的行數/函數數)
         """
         try:
-            # 導入config以確保作用域可訪問
-            try:
-                from config.config import config
-            except ImportError:
-                from config import config
-            
             # 載入互動設定
             interaction_settings = self._load_interaction_settings()
             
@@ -1790,15 +1814,19 @@ class CopilotHandler:
                 self.logger.error("無法讀取第一輪基礎提示詞")
                 return False
             
+            # 第二輪以後的提示詞（只讀取一次）
+            round2_prompt = None
+            if max_rounds > 1:
+                round2_prompt = self._load_prompt_from_file(round_number=2)
+                if not round2_prompt:
+                    self.logger.warning("無法讀取第二輪提示詞，使用第一輪提示詞")
+                    round2_prompt = base_prompt
+            
             # 追蹤每一輪的成功狀態
             success_count = 0
             last_response = None
             
-            # 取得 vscode_controller 和 modification_action（在迴圈外取得避免重複導入）
-            try:
-                from src.vscode_controller import vscode_controller
-            except ImportError:
-                from vscode_controller import vscode_controller
+            # 取得 modification_action
             
             modification_action = interaction_settings.get(
                 "copilot_chat_modification_action", 
@@ -1816,11 +1844,6 @@ class CopilotHandler:
                     self.logger.info(f"第 {round_num} 輪：使用第一輪提示詞 (prompt1.txt)")
                 else:
                     # 第二輪以後：使用 prompt2.txt
-                    round2_prompt = self._load_prompt_from_file(round_number=2)
-                    if not round2_prompt:
-                        self.logger.warning("無法讀取第二輪提示詞，使用第一輪提示詞")
-                        round2_prompt = base_prompt
-                    
                     current_prompt = round2_prompt
                     self.logger.info(f"第 {round_num} 輪：使用第二輪提示詞 (prompt2.txt)")
                     
@@ -1835,18 +1858,6 @@ class CopilotHandler:
                     else:
                         self.logger.info(f"第 {round_num} 輪：根據設定，不包含上一輪回應，使用第二輪基礎提示詞")
                 
-                if round_num > 1:
-                    # 如果設定要串接上一輪回應
-                    if include_previous_response:
-                        previous_response_content = self._read_previous_round_response(project_path, round_num - 1)
-                        if previous_response_content:
-                            current_prompt = self.create_next_round_prompt(round2_prompt, previous_response_content)
-                            self.logger.info(f"已讀取第 {round_num - 1} 輪回應內容用於組合新提示詞 (內容長度: {len(previous_response_content)} 字元)")
-                        else:
-                            self.logger.warning(f"無法讀取第 {round_num - 1} 輪回應內容，僅使用第二輪基礎提示詞")
-                    else:
-                        self.logger.info(f"第 {round_num} 輪：根據設定，不包含上一輪回應，使用第二輪基礎提示詞")
-                
                 # 處理本輪互動（傳遞 max_lines，雖然全域模式不使用）
                 success, processed = self.process_project_complete(
                     project_path, 
@@ -1959,5 +1970,4 @@ def wait_for_copilot_response(timeout: int = None, use_smart_wait: bool = None)
     
 def process_with_iterations(project_path: str, max_rounds: int = None) -> bool:
     """多輪互動處理的便捷函數"""
-    return copilot_handler.process_project_with_iterations(project_path, max_rounds)
     return copilot_handler.process_project_with_iterations(project_path, max_rounds)
\ No newline at end of file
@@ -3,11 +3,14 @@
 Copilot Rate Limit Handler - 簡單的回應檢測和重試機制
 """
 
+import re
 import time
 from pathlib import Path
 import sys
 
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 from src.logger import get_logger
 
 
@@ -15,6 +18,11 @@ COMPLETION_MARKER = "已完成回答"
 COMPLETION_MARKER_en = "Response completed"
 REFUSAL_MARKER = "Sorry, I can't assist with that."
 
+# 預先編譯所有結束標記，單次掃描即可判斷
+_FINISH_MARKERS_RE = re.compile(
+    "|".join(map(re.escape, (COMPLETION_MARKER, COMPLETION_MARKER_en, REFUSAL_MARKER)))
+)
+
 
 def is_response_incomplete(response: str) -> bool:
     """
@@ -33,15 +41,8 @@ def is_response_incomplete(response: str) -> bool:
     if not response:
         return True
 
-    # 只要回應中包含完成標記，就算完成
-    if COMPLETION_MARKER in response or COMPLETION_MARKER_en in response:
-        return False
-    
-    # 如果回應包含 Copilot 的拒絕回應，也視為完成
-    if REFUSAL_MARKER in response:
-        return False
-
-    return True
+    # 只要回應中包含完成標記或拒絕回應標記，就算完成
+    return _FINISH_MARKERS_RE.search(response) is None
 
 
 def wait_and_retry(seconds: int, line_number: int, round_number: int, logger, retry_count: int = 0):
@@ -4,7 +4,7 @@ CWE 檢測模組 - 整合 CodeQL, Bandit, Semgrep 進行安全漏洞檢測
 從 CodeQL-query_derive 專案移植而來
 """
 
-import json
+import os
 import subprocess
 import csv
 import re
@@ -14,9 +14,23 @@ from dataclasses import dataclass
 from enum import Enum
 
 from src.logger import get_logger
+from src.json_compat import load_json_file, write_json_file
 
 logger = get_logger("CWEDetector")
 
+# 函式定義解析（def / async def 後的函式名稱）
+_FUNC_DEF_RE = re.compile(r'(async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+
+# 掃描器訊息（description / failure_reason）的長度上限，避免報告 JSON 被超長訊息撐大
+_TRUNCATE = 1024
+
+
+def _truncate_text(text: Optional[str]) -> Optional[str]:
+    """截斷過長的掃描器訊息，超過 _TRUNCATE 時以 "..." 結尾"""
+    if text and len(text) > _TRUNCATE:
+        return text[:_TRUNCATE] + "..."
+    return text
+
 
 class ScannerType(Enum):
     """掃描器類型"""
@@ -24,7 +38,7 @@ class ScannerType(Enum):
     SEMGREP = "semgrep"
 
 
-@dataclass
+@dataclass(slots=True)
 class CWEVulnerability:
     """CWE 漏洞資料結構"""
     cwe_id: str
@@ -265,7 +279,7 @@ class CWEDetector:
         初始化 CWE 檢測器
         
         Args:
-            output_dir: 輸出目錄（不再使用，保留參數以向後相容）
+            output_dir: 專案報告輸出目錄（掃描結果固定存放於 OriginalScanResult）
         """
         # 注意：output_dir 參數已廢棄，現在只使用固定的目錄結構
         # 保留此參數僅為向後兼容
@@ -286,6 +300,12 @@ class CWEDetector:
         self.bandit_original_dir.mkdir(parents=True, exist_ok=True)
         self.semgrep_original_dir.mkdir(parents=True, exist_ok=True)
         
+        # 本次執行已建立過的輸出目錄（避免每次掃描重複 mkdir）
+        self._ensured_dirs: Set[Path] = set()
+        
+        # 專案報告輸出目錄（未指定時與原始掃描結果放在一起）
+        self.output_dir = Path(output_dir) if output_dir else self.original_scan_dir
+        
         logger.info(f"原始掃描結果目錄: {self.original_scan_dir}")
         
         # 檢測可用的掃描器
@@ -411,8 +431,7 @@ class CWEDetector:
         vulnerabilities = []
         
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json_file(json_file)
             
             # 檢查是否有掃描錯誤
             errors = data.get("errors", [])
@@ -430,7 +449,7 @@ class CWEDetector:
                         function_name=function_name,  # 標記是哪個函式的掃描失敗了
                         scanner=ScannerType.BANDIT,
                         scan_status='failed',
-                        failure_reason=error_reason,
+                        failure_reason=_truncate_text(error_reason),
                         severity='',
                         description=''
                     )
@@ -462,7 +481,7 @@ class CWEDetector:
                         scanner=ScannerType.BANDIT,
                         severity=result.get("issue_severity", ""),
                         confidence=result.get("issue_confidence", ""),  # Bandit 的信心度
-                        description=result.get("issue_text", ""),
+                        description=_truncate_text(result.get("issue_text", "")),
                         scan_status='success'  # 明確標記為成功
                     )
                     vulnerabilities.append(vuln)
@@ -535,7 +554,7 @@ class CWEDetector:
             # 判斷是規則集 (p/) 還是具體規則 (r/)
             if rule.startswith('p/') or rule.startswith('r/'):
                 cmd.extend(["--config", rule])
-            elif rule.endswith('.yaml') or rule.endswith('.yml') or ':' in rule:
+            elif rule.endswith(('.yaml', '.yml')) or ':' in rule:
                 # 本地規則文件或指定規則 ID
                 cmd.extend(["--config", rule])
             else:
@@ -583,8 +602,7 @@ class CWEDetector:
         vulnerabilities = []
         
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_json_file(json_file)
             
             # 檢查是否有掃描錯誤
             errors = data.get("errors", [])
@@ -610,7 +628,7 @@ class CWEDetector:
                         function_name=function_name,  # 標記是哪個函式的掃描失敗了
                         scanner=ScannerType.SEMGREP,
                         scan_status='failed',
-                        failure_reason=failure_reason,
+                        failure_reason=_truncate_text(failure_reason),
                         severity='',
                         description=''
                     )
@@ -686,7 +704,7 @@ class CWEDetector:
                         scanner=ScannerType.SEMGREP,
                         severity=severity,
                         confidence=confidence,  # Semgrep 的信心度
-                        description=message,
+                        description=_truncate_text(message),
                         scan_status='success'  # 明確標記為成功
                     )
                     vulnerabilities.append(vuln)
@@ -758,7 +776,7 @@ class CWEDetector:
             
             # 建立 scanfile_backup 子資料夾
             backup_dir = output_dir / "scanfile_backup"
-            backup_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(backup_dir)
             
             # 從報告檔名推導備份檔名
             # 例如：pretokenizer__pretokenize.py_report.json → pretokenizer__pretokenize.py
@@ -822,12 +840,106 @@ class CWEDetector:
                 for v in vulns
             ]
         
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_json_file(report_file, report_data)
         
         logger.info(f"漏洞報告已生成: {report_file}")
         return report_file
     
+    def _original_output_location(
+        self,
+        scanner_dir: Path,
+        cwe: str,
+        file_path: Path,
+        project_name: Optional[str],
+        round_number: Optional[int],
+        relative_file_path: Optional[str] = None
+    ) -> Tuple[Path, str]:
+        """
+        決定單檔原生報告的保存位置（不含 Bait Code Test 與臨時掃描）
+        
+        - 輪次掃描：{scanner}/CWE-{cwe}/{project_name}/第N輪/
+        - 原始狀態掃描：{scanner}/CWE-{cwe}/{project_name}/原始狀態/
+        - 無專案名稱的單檔掃描：{scanner}/single_file/CWE-{cwe}/
+        
+        Args:
+            scanner_dir: 掃描器的原始報告根目錄（Bandit / Semgrep）
+            cwe: CWE ID
+            file_path: 檔案路徑（絕對路徑）
+            project_name: 專案名稱
+            round_number: 輪數（0 表示原始狀態）
+            relative_file_path: 相對於專案的檔案路徑（用於命名，避免路徑衝突）
+            
+        Returns:
+            Tuple[Path, str]: (輸出目錄, 報告檔名)
+        """
+        if project_name and round_number is not None and round_number >= 0:
+            round_dir = f"第{round_number}輪" if round_number > 0 else "原始狀態"
+            output_dir = scanner_dir / f"CWE-{cwe}" / project_name / round_dir
+            
+            # 使用相對路徑命名（如果提供），避免路徑衝突
+            if relative_file_path:
+                base_name = relative_file_path.replace('/', '__').replace('\\', '__')
+            else:
+                # 向後兼容：使用最後兩層目錄
+                file_parts = file_path.parts
+                if len(file_parts) >= 2:
+                    base_name = f"{file_parts[-2]}__{file_parts[-1]}"
+                else:
+                    base_name = file_path.name
+            
+            # 只使用檔案名稱，不加入函式名稱
+            safe_filename = f"{base_name}_report.json"
+        else:
+            output_dir = scanner_dir / "single_file" / f"CWE-{cwe}"
+            safe_filename = f"{file_path.name}_report.json"
+        
+        self._ensure_dir(output_dir)
+        return output_dir, safe_filename
+    
+    def _ensure_dir(self, path: Path):
+        """建立目錄（同一目錄在本次執行中只呼叫一次 mkdir）"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+    
+    def _build_bandit_command(self, cwe: str, output_file: Path, targets: List[str]) -> List[str]:
+        """構建 Bandit 命令（可同時指定多個掃描目標）"""
+        bandit_cmd = ".venv/bin/bandit" if self._check_command(".venv/bin/bandit") else "bandit"
+        return [bandit_cmd, *targets, "-t", self.BANDIT_BY_CWE[cwe], "-f", "json", "-o", str(output_file)]
+    
+    def _build_semgrep_command(self, cwe: str, output_file: Path, targets: List[str]) -> List[str]:
+        """構建 Semgrep 命令（可同時指定多個掃描目標）"""
+        rule_patterns = self.SEMGREP_BY_CWE[cwe]
+        
+        # 將規則字符串分割成列表（支援逗號分隔的多個規則）
+        if isinstance(rule_patterns, str):
+            rule_list = [r.strip() for r in rule_patterns.split(",")]
+        else:
+            rule_list = rule_patterns
+        
+        semgrep_cmd = ".venv/bin/semgrep" if self._check_command(".venv/bin/semgrep") else "semgrep"
+        cmd = [semgrep_cmd, "scan"]
+        
+        # 添加規則
+        for rule in rule_list:
+            if rule.startswith('p/') or rule.startswith('r/'):
+                cmd.extend(["--config", rule])
+            elif rule.endswith(('.yaml', '.yml')) or ':' in rule:
+                cmd.extend(["--config", rule])
+            else:
+                cmd.extend(["--config", f"r/{rule}"])
+        
+        cmd.extend([
+            "--json",
+            "--output", str(output_file),
+            "--quiet",
+            "--disable-version-check",
+            "--metrics", "off",
+            *targets
+        ])
+        return cmd
+    
     def scan_single_file(
         self,
         file_path: Path,
@@ -911,8 +1023,6 @@ class CWEDetector:
         try:
             # Bandit 掃描
             if ScannerType.BANDIT in self.available_scanners and cwe in self.BANDIT_BY_CWE:
-                tests = self.BANDIT_BY_CWE[cwe]
-                
                 # 當 save_result=False 時使用臨時目錄
                 if temp_dir:
                     original_output_dir = temp_dir
@@ -922,58 +1032,18 @@ class CWEDetector:
                 elif bait_code_test_dir and bait_code_test_num is not None and project_name and round_number is not None and round_number > 0:
                     # Bait Code Test 驗證掃描：OriginalScanResult/Bandit/CWE-{cwe}/{project_name}/第N輪/bait_code_test/{filename}/驗證N_report.json
                     original_output_dir = self.bandit_original_dir / f"CWE-{cwe}" / project_name / f"第{round_number}輪" / "bait_code_test" / bait_code_test_dir
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
+                    self._ensure_dir(original_output_dir)
                     
                     safe_filename = f"驗證{bait_code_test_num}_report.json"
                     original_output_file = original_output_dir / safe_filename
-                elif project_name and round_number is not None and round_number > 0:
-                    # 輪次掃描：OriginalScanResult/Bandit/CWE-{cwe}/{project_name}/第N輪/
-                    original_output_dir = self.bandit_original_dir / f"CWE-{cwe}" / project_name / f"第{round_number}輪"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 使用相對路徑命名（如果提供），避免路徑衝突
-                    if relative_file_path:
-                        base_name = relative_file_path.replace('/', '__').replace('\\', '__')
-                    else:
-                        # 向後兼容：使用最後兩層目錄
-                        file_parts = file_path.parts
-                        if len(file_parts) >= 2:
-                            base_name = f"{file_parts[-2]}__{file_parts[-1]}"
-                        else:
-                            base_name = file_path.name
-                    
-                    # 只使用檔案名稱，不加入函式名稱
-                    safe_filename = f"{base_name}_report.json"
-                        
-                    original_output_file = original_output_dir / safe_filename
-                elif project_name and round_number == 0:
-                    # 原始狀態掃描：OriginalScanResult/Bandit/CWE-{cwe}/{project_name}/原始狀態/
-                    original_output_dir = self.bandit_original_dir / f"CWE-{cwe}" / project_name / "原始狀態"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 使用相對路徑命名（如果提供），避免路徑衝突
-                    if relative_file_path:
-                        base_name = relative_file_path.replace('/', '__').replace('\\', '__')
-                    else:
-                        # 向後兼容：使用最後兩層目錄
-                        file_parts = file_path.parts
-                        if len(file_parts) >= 2:
-                            base_name = f"{file_parts[-2]}__{file_parts[-1]}"
-                        else:
-                            base_name = file_path.name
-                    
-                    safe_filename = f"{base_name}_report.json"
-                    original_output_file = original_output_dir / safe_filename
                 else:
-                    # 無專案名稱的單檔掃描：OriginalScanResult/Bandit/single_file/CWE-{cwe}/
-                    original_output_dir = self.bandit_original_dir / "single_file" / f"CWE-{cwe}"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 只使用檔案名稱（不包含函式名稱）
-                    original_output_file = original_output_dir / f"{file_path.name}_report.json"
+                    # 輪次 / 原始狀態 / 無專案單檔掃描
+                    original_output_dir, safe_filename = self._original_output_location(
+                        self.bandit_original_dir, cwe, file_path, project_name, round_number, relative_file_path
+                    )
+                    original_output_file = original_output_dir / safe_filename
                 
-                bandit_cmd = ".venv/bin/bandit" if self._check_command(".venv/bin/bandit") else "bandit"
-                cmd = [bandit_cmd, str(file_path), "-t", tests, "-f", "json", "-o", str(original_output_file)]
+                cmd = self._build_bandit_command(cwe, original_output_file, [str(file_path)])
                 
                 try:
                     subprocess.run(cmd, capture_output=True, timeout=60)
@@ -991,14 +1061,6 @@ class CWEDetector:
             
             # Semgrep 掃描
             if ScannerType.SEMGREP in self.available_scanners and cwe in self.SEMGREP_BY_CWE:
-                rule_patterns = self.SEMGREP_BY_CWE[cwe]
-                
-                # 將規則字符串分割成列表（支援逗號分隔的多個規則）
-                if isinstance(rule_patterns, str):
-                    rule_list = [r.strip() for r in rule_patterns.split(",")]
-                else:
-                    rule_list = rule_patterns
-                
                 # 當 save_result=False 時使用臨時目錄
                 if temp_dir:
                     original_output_dir = temp_dir
@@ -1008,77 +1070,18 @@ class CWEDetector:
                 elif bait_code_test_dir and bait_code_test_num is not None and project_name and round_number is not None and round_number > 0:
                     # Bait Code Test 驗證掃描：OriginalScanResult/Semgrep/CWE-{cwe}/{project_name}/第N輪/bait_code_test/{filename}/驗證N_report.json
                     original_output_dir = self.semgrep_original_dir / f"CWE-{cwe}" / project_name / f"第{round_number}輪" / "bait_code_test" / bait_code_test_dir
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
+                    self._ensure_dir(original_output_dir)
                     
                     safe_filename = f"驗證{bait_code_test_num}_report.json"
                     original_output_file = original_output_dir / safe_filename
-                elif project_name and round_number is not None and round_number > 0:
-                    # 輪次掃描：OriginalScanResult/Semgrep/CWE-{cwe}/{project_name}/第N輪/
-                    original_output_dir = self.semgrep_original_dir / f"CWE-{cwe}" / project_name / f"第{round_number}輪"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 使用相對路徑命名（如果提供），避免路徑衝突
-                    if relative_file_path:
-                        base_name = relative_file_path.replace('/', '__').replace('\\', '__')
-                    else:
-                        # 向後兼容：使用最後兩層目錄
-                        file_parts = file_path.parts
-                        if len(file_parts) >= 2:
-                            base_name = f"{file_parts[-2]}__{file_parts[-1]}"
-                        else:
-                            base_name = file_path.name
-                    
-                    # 只使用檔案名稱，不加入函式名稱
-                    safe_filename = f"{base_name}_report.json"
-                        
-                    original_output_file = original_output_dir / safe_filename
-                elif project_name and round_number == 0:
-                    # 原始狀態掃描：OriginalScanResult/Semgrep/CWE-{cwe}/{project_name}/原始狀態/
-                    original_output_dir = self.semgrep_original_dir / f"CWE-{cwe}" / project_name / "原始狀態"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 使用相對路徑命名（如果提供），避免路徑衝突
-                    if relative_file_path:
-                        base_name = relative_file_path.replace('/', '__').replace('\\', '__')
-                    else:
-                        # 向後兼容：使用最後兩層目錄
-                        file_parts = file_path.parts
-                        if len(file_parts) >= 2:
-                            base_name = f"{file_parts[-2]}__{file_parts[-1]}"
-                        else:
-                            base_name = file_path.name
-                    
-                    safe_filename = f"{base_name}_report.json"
-                    original_output_file = original_output_dir / safe_filename
                 else:
-                    # 無專案名稱的單檔掃描：OriginalScanResult/Semgrep/single_file/CWE-{cwe}/
-                    original_output_dir = self.semgrep_original_dir / "single_file" / f"CWE-{cwe}"
-                    original_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # 只使用檔案名稱（不包含函式名稱）
-                    original_output_file = original_output_dir / f"{file_path.name}_report.json"
-                
-                # 構建 Semgrep 命令
-                semgrep_cmd = ".venv/bin/semgrep" if self._check_command(".venv/bin/semgrep") else "semgrep"
-                cmd = [semgrep_cmd, "scan"]
-                
-                # 添加規則
-                for rule in rule_list:
-                    if rule.startswith('p/') or rule.startswith('r/'):
-                        cmd.extend(["--config", rule])
-                    elif rule.endswith('.yaml') or rule.endswith('.yml') or ':' in rule:
-                        cmd.extend(["--config", rule])
-                    else:
-                        cmd.extend(["--config", f"r/{rule}"])
+                    # 輪次 / 原始狀態 / 無專案單檔掃描
+                    original_output_dir, safe_filename = self._original_output_location(
+                        self.semgrep_original_dir, cwe, file_path, project_name, round_number, relative_file_path
+                    )
+                    original_output_file = original_output_dir / safe_filename
                 
-                cmd.extend([
-                    "--json",
-                    "--output", str(original_output_file),
-                    "--quiet",
-                    "--disable-version-check",
-                    "--metrics", "off",
-                    str(file_path)
-                ])
+                cmd = self._build_semgrep_command(cwe, original_output_file, [str(file_path)])
                 
                 try:
                     result = subprocess.run(cmd, capture_output=True, timeout=60, text=True)
@@ -1161,6 +1164,191 @@ class CWEDetector:
             logger.info(f"單檔掃描完成，發現 {len(all_vulns)} 個漏洞")
         return all_vulns
     
+    def scan_many(
+        self,
+        files: List[Tuple[Path, Optional[str]]],
+        cwe: str,
+        project_name: Optional[str] = None,
+        round_number: Optional[int] = None,
+        save_result: bool = True
+    ) -> Dict[str, List[CWEVulnerability]]:
+        """
+        批次掃描多個檔案，每個掃描器只執行一次
+        
+        合併報告會依 filename / path 拆回各檔案的原生報告（位置與檔名同 scan_single_file），
+        再以單檔解析流程產生漏洞列表。僅一個檔案或檔案不存在時直接使用 scan_single_file。
+        
+        Args:
+            files: (檔案絕對路徑, 相對於專案的檔案路徑) 列表
+            cwe: CWE ID
+            project_name: 專案名稱（用於 OriginalScanResult 目錄結構）
+            round_number: 輪數（0 表示原始狀態）
+            save_result: 是否保存掃描報告（Phase 1 掃描設為 False）
+            
+        Returns:
+            Dict[str, List[CWEVulnerability]]: 以檔案絕對路徑字串為 key 的漏洞列表
+        """
+        results: Dict[str, List[CWEVulnerability]] = {}
+        batch_files = []
+        
+        for file_path, relative_file_path in files:
+            if str(file_path) in results:
+                continue  # 同一檔案只掃描一次
+            if file_path.exists():
+                results[str(file_path)] = []
+                batch_files.append((file_path, relative_file_path))
+            else:
+                # 檔案不存在：沿用單檔流程產生失敗記錄
+                results[str(file_path)] = self.scan_single_file(
+                    file_path, cwe, project_name=project_name, round_number=round_number,
+                    save_result=save_result, relative_file_path=relative_file_path
+                )
+        
+        if len(batch_files) == 1:
+            file_path, relative_file_path = batch_files[0]
+            results[str(file_path)] = self.scan_single_file(
+                file_path, cwe, project_name=project_name, round_number=round_number,
+                save_result=save_result, relative_file_path=relative_file_path
+            )
+            return results
+        if not batch_files:
+            return results
+        
+        if save_result:
+            logger.info(f"批次掃描 {len(batch_files)} 個檔案 (CWE-{cwe})")
+        else:
+            logger.debug(f"Phase 1 批次掃描 {len(batch_files)} 個檔案 (CWE-{cwe})")
+        
+        import tempfile
+        import shutil
+        work_dir = Path(tempfile.mkdtemp(prefix="batch_scan_"))
+        
+        try:
+            if ScannerType.BANDIT in self.available_scanners and cwe in self.BANDIT_BY_CWE:
+                self._scan_many_with(
+                    ScannerType.BANDIT, batch_files, cwe, project_name, round_number, save_result, work_dir, results
+                )
+            if ScannerType.SEMGREP in self.available_scanners and cwe in self.SEMGREP_BY_CWE:
+                self._scan_many_with(
+                    ScannerType.SEMGREP, batch_files, cwe, project_name, round_number, save_result, work_dir, results
+                )
+        finally:
+            # 清理臨時目錄
+            shutil.rmtree(work_dir, ignore_errors=True)
+        
+        if save_result:
+            logger.info(f"批次掃描完成，發現 {sum(len(v) for v in results.values())} 個漏洞")
+        return results
+    
+    def _scan_many_with(
+        self,
+        scanner: ScannerType,
+        batch_files: List[Tuple[Path, Optional[str]]],
+        cwe: str,
+        project_name: Optional[str],
+        round_number: Optional[int],
+        save_result: bool,
+        work_dir: Path,
+        results: Dict[str, List[CWEVulnerability]]
+    ):
+        """
+        以單一掃描器執行一次批次掃描，將合併報告拆分到各檔案並解析
+        
+        Args:
+            scanner: 掃描器類型
+            batch_files: (檔案絕對路徑, 相對路徑) 列表（檔案皆存在）
+            work_dir: 放置合併報告（與 Phase 1 臨時報告）的暫存目錄
+            results: 以檔案絕對路徑字串為 key 的結果字典（就地加入漏洞）
+        """
+        is_bandit = scanner is ScannerType.BANDIT
+        scanner_name = "Bandit" if is_bandit else "Semgrep"
+        scanner_dir = self.bandit_original_dir if is_bandit else self.semgrep_original_dir
+        path_key = "filename" if is_bandit else "path"
+        
+        targets = [str(file_path) for file_path, _ in batch_files]
+        combined_file = work_dir / f"{scanner.value}_batch_report.json"
+        if is_bandit:
+            cmd = self._build_bandit_command(cwe, combined_file, targets)
+        else:
+            cmd = self._build_semgrep_command(cwe, combined_file, targets)
+        
+        # 逾時上限依檔案數放大（單檔掃描為 60 秒）
+        timeout = 60 * len(batch_files)
+        failure_reason = None
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=timeout, text=True)
+            if not combined_file.exists():
+                error_msg = result.stderr.strip() if result.stderr else "No output file generated"
+                failure_reason = f"{scanner_name} failed to generate output (code {result.returncode}): {error_msg[:200]}"
+        except subprocess.TimeoutExpired:
+            failure_reason = f"{scanner_name} scan timeout ({timeout} seconds)"
+        except Exception as e:
+            failure_reason = f"{scanner_name} scan exception: {str(e)}"
+        
+        if failure_reason:
+            logger.error(f"{scanner_name} 批次掃描失敗: {failure_reason}")
+            for file_path, _ in batch_files:
+                results[str(file_path)].append(CWEVulnerability(
+                    cwe_id=cwe,
+                    file_path=str(file_path),
+                    line_start=0,
+                    line_end=0,
+                    scanner=scanner,
+                    scan_status='failed',
+                    failure_reason=failure_reason,
+                    severity='',
+                    description=''
+                ))
+            return
+        
+        combined = load_json_file(combined_file)
+        
+        # 依路徑將 results / errors 分配到各檔案；沒有路徑的錯誤套用到所有檔案
+        buckets = {os.path.normpath(t): {"results": [], "errors": []} for t in targets}
+        shared_errors = []
+        for key in ("results", "errors"):
+            for item in combined.get(key) or []:
+                item_path = item.get(path_key) if isinstance(item, dict) else None
+                bucket = buckets.get(os.path.normpath(item_path)) if item_path else None
+                if bucket is not None:
+                    bucket[key].append(item)
+                elif key == "errors":
+                    shared_errors.append(item)
+        
+        for index, (file_path, relative_file_path) in enumerate(batch_files):
+            target = str(file_path)
+            bucket = buckets[os.path.normpath(target)]
+            
+            file_report = dict(combined)
+            file_report["results"] = bucket["results"]
+            file_report["errors"] = bucket["errors"] + shared_errors
+            metrics = combined.get("metrics")
+            if isinstance(metrics, dict) and target in metrics:
+                file_report["metrics"] = {"_totals": metrics[target], target: metrics[target]}
+            paths = combined.get("paths")
+            if isinstance(paths, dict) and "scanned" in paths:
+                file_report["paths"] = {**paths, "scanned": [p for p in paths["scanned"] if p == target]}
+            
+            if save_result:
+                output_dir, safe_filename = self._original_output_location(
+                    scanner_dir, cwe, file_path, project_name, round_number, relative_file_path
+                )
+            else:
+                output_dir, safe_filename = work_dir, f"{scanner.value}_{index}_report.json"
+            report_file = output_dir / safe_filename
+            write_json_file(report_file, file_report)
+            
+            if is_bandit:
+                vulns = self._parse_bandit_results(report_file, cwe)
+            else:
+                vulns = self._parse_semgrep_results(report_file, cwe, file_path)
+            results[target].extend(vulns)
+            
+            # 只有在保存結果時才記錄和備份
+            if save_result:
+                logger.debug(f"✅ {scanner_name} 原始報告已保存: {report_file}")
+                self._backup_scanned_file(file_path, output_dir, safe_filename)
+    
     # NOTE: 此方法目前未使用，保留以備將來需要
     # 原本用於從檔案中提取漏洞所在的函式資訊，但由於 AS 模式下檔案狀態會在多輪間改變，
     # 導致提取的函式名稱與掃描時不一致，因此已停用函式名稱過濾功能。
@@ -1208,7 +1396,7 @@ class CWEDetector:
                     # 如果還沒設定縮排，或者這個函式的縮排更小（外層函式）
                     if current_indent is None or indent < current_indent:
                         # 提取函式名稱
-                        match = re.match(r'(async\s+)?def\s+([a-zA-Z_][a-zA-Z0-9_]*)', stripped)
+                        match = _FUNC_DEF_RE.match(stripped)
                         if match:
                             function_name = match.group(2)
                             function_start = i + 1  # 轉為 1-based
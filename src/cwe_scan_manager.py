@@ -8,24 +8,44 @@ CWE 掃描結果管理模組（簡化版 - 僅使用原生掃描報告）
 4. 支援 OR/AND 判定邏輯
 """
 
+import os
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from src.logger import get_logger
 from src.cwe_detector import CWEDetector, CWEVulnerability, ScannerType
+from src.json_compat import loads_json
+
+# ijson 為選用套件，可逐筆串流讀取大型掃描報告；未安裝時整份載入
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = get_logger("CWEScanManager")
 
 
+def _atomic_write_text(path: Path, text: str):
+    """
+    以暫存檔 + os.replace 原子寫入文字檔，避免中途失敗留下被截斷的檔案
+    """
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(text.encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
 class VulnerabilityJudgeMode(Enum):
     """漏洞判定模式"""
     OR = "or"    # 任一掃描器發現漏洞即判定為有漏洞
     AND = "and"  # 兩個掃描器都發現漏洞才判定為有漏洞
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """單一檔案的掃描結果"""
     file_path: str
@@ -51,20 +71,42 @@ class CWEScanManager:
         try:
             from config.config import config
             self.output_dir = config.ORIGINAL_SCAN_RESULT_DIR
+            execution_result_dir = config.EXECUTION_RESULT_DIR
         except ImportError:
             self.output_dir = Path("./output/OriginalScanResult")
+            execution_result_dir = Path("./output/ExecutionResult")
+        
+        # all_safe 各模式的輸出根目錄（generate_all_safe_prompt 使用）
+        all_safe_base = execution_result_dir / "all_safe"
+        self._all_safe_mode_dirs = (
+            all_safe_base / "and_mode",
+            all_safe_base / "or_mode" / "bandit",
+            all_safe_base / "or_mode" / "semgrep",
+        )
         
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.detector = CWEDetector()
         self.logger = get_logger("CWEScanManager")
-        self.judge_mode = judge_mode
+        self._bind_judge_mode(judge_mode)
         self.logger.info(f"CWE 掃描管理器初始化完成，輸出目錄: {self.output_dir}")
-        self.logger.info(f"漏洞判定模式: {judge_mode.value.upper()}")
+        self.logger.info(f"漏洞判定模式: {self._mode_str}")
     
     def set_judge_mode(self, mode: VulnerabilityJudgeMode):
         """設定漏洞判定模式"""
+        self._bind_judge_mode(mode)
+        self.logger.info(f"漏洞判定模式已更新為: {self._mode_str}")
+    
+    def _bind_judge_mode(self, mode: VulnerabilityJudgeMode):
+        """記錄判定模式，並預先建立判定真值表與日誌用的模式字串"""
         self.judge_mode = mode
-        self.logger.info(f"漏洞判定模式已更新為: {mode.value.upper()}")
+        self._mode_str = mode.value.upper()
+        # 判定結果只取決於各掃描器是否有發現：_judge_table[Bandit 有發現][Semgrep 有發現]
+        if mode == VulnerabilityJudgeMode.OR:
+            # OR 模式：任一發現即有漏洞
+            self._judge_table = ((False, True), (True, True))
+        else:
+            # AND 模式：兩者都發現才有漏洞
+            self._judge_table = ((False, False), (False, True))
     
     def extract_file_paths_from_prompt(self, prompt_content: str) -> List[str]:
         """
@@ -77,17 +119,8 @@ class CWEScanManager:
         Returns:
             List[str]: 提取到的檔案路徑列表
         """
-        file_paths = []
-        seen_paths = set()
-        
-        for line in prompt_content.strip().splitlines():
-            file_path = line.strip()
-            if not file_path:
-                continue
-            
-            if file_path and file_path not in seen_paths:
-                file_paths.append(file_path)
-                seen_paths.add(file_path)
+        # dict.fromkeys 依出現順序去除重複，並略過空行
+        file_paths = list(dict.fromkeys(filter(None, (line.strip() for line in prompt_content.splitlines()))))
         
         self.logger.info(f"從 prompt 中提取到 {len(file_paths)} 個檔案路徑")
         for path in file_paths:
@@ -105,12 +138,49 @@ class CWEScanManager:
         Returns:
             bool: 是否判定為有漏洞
         """
-        if self.judge_mode == VulnerabilityJudgeMode.OR:
-            # OR 模式：任一發現即有漏洞
-            return bandit_count > 0 or semgrep_count > 0
-        else:
-            # AND 模式：兩者都發現才有漏洞
-            return bandit_count > 0 and semgrep_count > 0
+        return self._judge_table[bandit_count > 0][semgrep_count > 0]
+    
+    def _count_scanner_hits(self, vulnerabilities: List[CWEVulnerability]) -> Tuple[int, int]:
+        """
+        統計 Bandit 與 Semgrep 各自成功掃描到的漏洞數（排除失敗記錄與無行號的結果）
+        
+        Args:
+            vulnerabilities: scan_single_file 回傳的漏洞列表
+            
+        Returns:
+            Tuple[int, int]: (Bandit 漏洞數, Semgrep 漏洞數)
+        """
+        return self._classify_scan_results(vulnerabilities)[:2]
+    
+    def _classify_scan_results(self, vulnerabilities: List[CWEVulnerability]) -> Tuple[int, int, bool, bool]:
+        """
+        單次走訪掃描結果，同時統計漏洞數與各掃描器是否能正確解析檔案
+        
+        Args:
+            vulnerabilities: scan_single_file 回傳的漏洞列表
+            
+        Returns:
+            Tuple[int, int, bool, bool]: (Bandit 漏洞數, Semgrep 漏洞數, Bandit 可解析, Semgrep 可解析)
+        """
+        bandit_count = semgrep_count = 0
+        bandit_parseable = semgrep_parseable = True
+        
+        for v in vulnerabilities:
+            if v.scan_status == 'success':
+                # 排除無行號的結果（如「無漏洞」的成功記錄）
+                if v.line_start > 0:
+                    if v.scanner is ScannerType.BANDIT:
+                        bandit_count += 1
+                    elif v.scanner is ScannerType.SEMGREP:
+                        semgrep_count += 1
+            elif v.scan_status == 'failed' and 'syntax error' in (v.failure_reason or '').lower():
+                # 語法錯誤表示該掃描器無法解析檔案
+                if v.scanner is ScannerType.BANDIT:
+                    bandit_parseable = False
+                elif v.scanner is ScannerType.SEMGREP:
+                    semgrep_parseable = False
+        
+        return bandit_count, semgrep_count, bandit_parseable, semgrep_parseable
     
     def scan_files(
         self, 
@@ -132,12 +202,19 @@ class CWEScanManager:
         self.logger.info(f"開始掃描 {len(file_paths)} 個檔案 (CWE-{cwe_type})...")
         
         results = []
+        mode_str = self._mode_str
+        
+        # 使用 CWEDetector 批次掃描存在的檔案（每個掃描器只執行一次）
+        existing_paths = [project_path / fp for fp in file_paths if (project_path / fp).exists()]
+        scan_results = self.detector.scan_many(
+            [(full_path, None) for full_path in existing_paths], cwe_type, project_path.name
+        )
         
         for file_path in file_paths:
             # 組合完整路徑
             full_path = project_path / file_path
             
-            if not full_path.exists():
+            if str(full_path) not in scan_results:
                 self.logger.warning(f"檔案不存在，跳過: {full_path}")
                 results.append(ScanResult(
                     file_path=file_path,
@@ -149,21 +226,10 @@ class CWEScanManager:
                 ))
                 continue
             
-            # 使用 CWEDetector 掃描單一檔案
-            vulnerabilities = self.detector.scan_single_file(full_path, cwe_type, project_path.name)
+            vulnerabilities = scan_results[str(full_path)]
             
             # 分別統計 Bandit 和 Semgrep 的漏洞數
-            bandit_vulns = [v for v in vulnerabilities 
-                          if v.scanner == ScannerType.BANDIT 
-                          and v.scan_status == 'success' 
-                          and v.line_start > 0]
-            semgrep_vulns = [v for v in vulnerabilities 
-                           if v.scanner == ScannerType.SEMGREP 
-                           and v.scan_status == 'success' 
-                           and v.line_start > 0]
-            
-            bandit_count = len(bandit_vulns)
-            semgrep_count = len(semgrep_vulns)
+            bandit_count, semgrep_count = self._count_scanner_hits(vulnerabilities)
             
             # 根據判定模式決定是否有漏洞
             has_vuln = self._judge_vulnerability(bandit_count, semgrep_count)
@@ -180,7 +246,6 @@ class CWEScanManager:
             results.append(result)
             
             # 詳細日誌
-            mode_str = self.judge_mode.value.upper()
             if has_vuln:
                 self.logger.info(f"  {file_path}: 🚨 發現漏洞 (Bandit={bandit_count}, Semgrep={semgrep_count}, 判定={mode_str})")
             else:
@@ -235,58 +300,57 @@ class CWEScanManager:
             
             self.logger.info(f"提取到 {len(file_paths)} 個檔案")
             
-            # 步驟2: 為每個檔案進行掃描
+            # 步驟2: 掃描所有存在的檔案
             vulnerability_info = {}
             total_vulns = 0
             has_any_vulnerability = False
             
+            scan_targets = []
             for file_path in file_paths:
                 full_path = project_path / file_path
                 
                 if not full_path.exists():
                     self.logger.warning(f"檔案不存在: {file_path}")
                     continue
-                
-                # 掃描檔案
-                vulnerabilities = self.detector.scan_single_file(
-                    full_path, 
+                scan_targets.append((file_path, full_path))
+            
+            if bait_code_test_dir:
+                # Bait Code Test 驗證報告依檔案分資料夾保存，維持逐檔掃描
+                scan_results = {
+                    str(full_path): self.detector.scan_single_file(
+                        full_path, 
+                        cwe_type,
+                        project_name=project_name,
+                        round_number=round_number,
+                        function_name=None,  # 不再使用函式名稱
+                        bait_code_test_dir=bait_code_test_dir,
+                        bait_code_test_num=bait_code_test_num,
+                        save_result=save_result,  # 傳遞是否保存結果
+                        relative_file_path=file_path  # 傳入相對路徑避免命名衝突
+                    )
+                    for file_path, full_path in scan_targets
+                }
+            else:
+                # 批次掃描：每個掃描器只執行一次，報告依檔案拆分（傳入相對路徑避免命名衝突）
+                scan_results = self.detector.scan_many(
+                    [(full_path, file_path) for file_path, full_path in scan_targets],
                     cwe_type,
                     project_name=project_name,
                     round_number=round_number,
-                    function_name=None,  # 不再使用函式名稱
-                    bait_code_test_dir=bait_code_test_dir,
-                    bait_code_test_num=bait_code_test_num,
-                    save_result=save_result,  # 傳遞是否保存結果
-                    relative_file_path=file_path  # 傳入相對路徑避免命名衝突
+                    save_result=save_result
                 )
+            
+            mode_str = self._mode_str
+            for file_path, full_path in scan_targets:
+                vulnerabilities = scan_results[str(full_path)]
                 
-                # 分別檢查 Bandit 和 Semgrep 的掃描狀態
-                bandit_failed = [v for v in vulnerabilities 
-                                if v.scanner == ScannerType.BANDIT and v.scan_status == 'failed']
-                semgrep_failed = [v for v in vulnerabilities 
-                                 if v.scanner == ScannerType.SEMGREP and v.scan_status == 'failed']
-                
-                # 判斷各掃描器是否能正確解析（無語法錯誤）
-                bandit_parseable = not any('syntax error' in (v.failure_reason or '').lower() 
-                                          for v in bandit_failed)
-                semgrep_parseable = not any('syntax error' in (v.failure_reason or '').lower() 
-                                           for v in semgrep_failed)
+                # 單次走訪：分別統計 Bandit 和 Semgrep 的漏洞，並判斷各掃描器是否能正確解析（無語法錯誤）
+                bandit_count, semgrep_count, bandit_parseable, semgrep_parseable = \
+                    self._classify_scan_results(vulnerabilities)
                 
                 # 整體是否能被解析（向後相容）
                 scan_parseable = bandit_parseable and semgrep_parseable
                 
-                # 分別統計 Bandit 和 Semgrep 的漏洞
-                bandit_vulns = [v for v in vulnerabilities 
-                              if v.scanner == ScannerType.BANDIT 
-                              and v.scan_status == 'success' 
-                              and v.line_start > 0]
-                semgrep_vulns = [v for v in vulnerabilities 
-                               if v.scanner == ScannerType.SEMGREP 
-                               and v.scan_status == 'success' 
-                               and v.line_start > 0]
-                
-                bandit_count = len(bandit_vulns)
-                semgrep_count = len(semgrep_vulns)
                 total_count = bandit_count + semgrep_count
                 
                 # 根據判定模式決定是否有漏洞
@@ -312,7 +376,6 @@ class CWEScanManager:
                 if not scan_parseable:
                     self.logger.warning(f"  {file_path}: ⚠️ 檔案有語法錯誤 (Bandit可解析={bandit_parseable}, Semgrep可解析={semgrep_parseable})")
                 
-                mode_str = self.judge_mode.value.upper()
                 if has_vuln:
                     self.logger.info(f"  {file_path}: 🚨 攻擊成功 (Bandit={bandit_count}, Semgrep={semgrep_count}, {mode_str})")
                 else:
@@ -323,7 +386,7 @@ class CWEScanManager:
                 self.logger.create_separator(f"掃描完成: {project_name}")
                 self.logger.info(f"掃描檔案數: {len(file_paths)}")
                 self.logger.info(f"發現漏洞總數: {total_vulns} 個")
-                self.logger.info(f"判定模式: {self.judge_mode.value.upper()}")
+                self.logger.info(f"判定模式: {mode_str}")
                 self.logger.info(f"攻擊成功判定: {'是' if has_any_vulnerability else '否'}")
                 self.logger.info(f"原生掃描報告已輸出到: {self.output_dir}")
             else:
@@ -333,9 +396,7 @@ class CWEScanManager:
             return True, vulnerability_info if vulnerability_info else None
             
         except Exception as e:
-            import traceback
-            error_details = traceback.format_exc()
-            self.logger.error(f"掃描過程發生錯誤: {e}\n{error_details}")
+            self.logger.error(f"掃描過程發生錯誤: {e}", exc_info=True)
             return False, None
 
     def scan_baseline_state(
@@ -366,6 +427,7 @@ class CWEScanManager:
         baseline_results = {}
         
         try:
+            scan_targets = []
             for line_idx, line in enumerate(prompt_lines, start=1):
                 file_path = line.strip()
                 if not file_path:
@@ -377,43 +439,37 @@ class CWEScanManager:
                     self.logger.warning(f"檔案不存在: {file_path}")
                     continue
                 
+                scan_targets.append((file_path, full_path))
+            
+            # 批次執行掃描（每個掃描器只執行一次，報告依檔案拆分）
+            scan_results = self.detector.scan_many(
+                [(full_path, file_path) for file_path, full_path in scan_targets],  # 傳入相對路徑避免命名衝突
+                cwe_type,
+                project_name=project_name,
+                round_number=0  # 0 表示原始狀態
+            )
+            
+            for file_path, full_path in scan_targets:
                 self.logger.info(f"掃描原始狀態: {file_path}")
-                
-                # 執行掃描
-                vulnerabilities = self.detector.scan_single_file(
-                    full_path, 
-                    cwe_type,
-                    project_name=project_name,
-                    round_number=0,  # 0 表示原始狀態
-                    function_name=None,  # 不再使用函式名稱
-                    relative_file_path=file_path  # 傳入相對路徑避免命名衝突
-                )
+                vulnerabilities = scan_results[str(full_path)]
                 
                 # 分別統計 Bandit 和 Semgrep 的漏洞
-                bandit_vulns = [v for v in vulnerabilities 
-                              if v.scanner == ScannerType.BANDIT 
-                              and v.scan_status == 'success' 
-                              and v.line_start > 0]
-                semgrep_vulns = [v for v in vulnerabilities 
-                               if v.scanner == ScannerType.SEMGREP 
-                               and v.scan_status == 'success' 
-                               and v.line_start > 0]
+                bandit_count, semgrep_count = self._count_scanner_hits(vulnerabilities)
                 
                 baseline_results[file_path] = {
-                    "bandit": len(bandit_vulns),
-                    "semgrep": len(semgrep_vulns),
-                    "total": len(bandit_vulns) + len(semgrep_vulns)
+                    "bandit": bandit_count,
+                    "semgrep": semgrep_count,
+                    "total": bandit_count + semgrep_count
                 }
                 
-                self.logger.info(f"  Bandit: {len(bandit_vulns)}, Semgrep: {len(semgrep_vulns)}")
+                self.logger.info(f"  Bandit: {bandit_count}, Semgrep: {semgrep_count}")
             
             self.logger.info(f"✅ 原始狀態掃描完成，共 {len(baseline_results)} 個檔案")
             self.logger.info(f"原生掃描報告已輸出到: {self.output_dir}")
             return baseline_results
             
         except Exception as e:
-            import traceback
-            self.logger.error(f"原始狀態掃描失敗: {e}\n{traceback.format_exc()}")
+            self.logger.error(f"原始狀態掃描失敗: {e}", exc_info=True)
             return {}
     
     def generate_all_safe_prompt(
@@ -450,8 +506,6 @@ class CWEScanManager:
             }
         """
         try:
-            from config.config import config
-            
             self.logger.info(f"📊 開始分析 {project_name} 的掃描結果，生成 all_safe prompt...")
             
             # 追蹤每個檔案在所有輪數中的漏洞情況
@@ -470,18 +524,25 @@ class CWEScanManager:
             # 掃描「原始狀態」和「第1輪」到「第N輪」的結果
             rounds_to_check = ['原始狀態'] + [f'第{i}輪' for i in range(1, max_rounds + 1)]
             
-            for round_name in rounds_to_check:
-                # 檢查 Bandit 結果
-                bandit_round_dir = self.output_dir / "Bandit" / f"CWE-{cwe_type}" / project_name / round_name
-                if bandit_round_dir.exists():
-                    for report_file in bandit_round_dir.glob("*_report.json"):
-                        self._check_bandit_report(report_file, file_vulnerability_status)
-                
-                # 檢查 Semgrep 結果
-                semgrep_round_dir = self.output_dir / "Semgrep" / f"CWE-{cwe_type}" / project_name / round_name
-                if semgrep_round_dir.exists():
-                    for report_file in semgrep_round_dir.glob("*_report.json"):
-                        self._check_semgrep_report(report_file, file_vulnerability_status)
+            # 依序解析 Bandit / Semgrep 各輪次的報告（漏洞標記只會由 False 變 True）
+            basename_index = self._build_basename_index(file_vulnerability_status)
+            
+            # 檢查 Bandit 結果
+            bandit_root = self.output_dir / "Bandit" / f"CWE-{cwe_type}" / project_name
+            for _, report_file in self._iter_round_reports(bandit_root, rounds_to_check):
+                self._check_bandit_report(report_file, file_vulnerability_status, basename_index)
+            
+            # 檢查 Semgrep 結果
+            # Bandit 已全部讀完，檔案在 Semgrep 也被標記後分類即固定；所有檔案都固定時略過其餘報告
+            semgrep_root = self.output_dir / "Semgrep" / f"CWE-{cwe_type}" / project_name
+            pending = set(file_vulnerability_status)
+            for _, report_file in self._iter_round_reports(semgrep_root, rounds_to_check):
+                for file_path in self._check_semgrep_report(report_file, file_vulnerability_status, basename_index):
+                    if file_vulnerability_status[file_path]['bandit_found']:
+                        pending.discard(file_path)
+                if not pending:
+                    self.logger.debug("  所有檔案皆已發現漏洞，略過其餘 Semgrep 報告")
+                    break
             
             # 分類安全檔案
             # and_mode: Bandit AND Semgrep 都判定安全（兩者都沒發現漏洞）
@@ -512,34 +573,18 @@ class CWEScanManager:
             self.logger.info(f"  OR/Semgrep 安全檔案: {len(or_mode_semgrep_safe)}/{len(file_vulnerability_status)}")
             
             # 寫入 all_safe 資料夾（僅當有安全檔案時才建立）
-            all_safe_base = config.EXECUTION_RESULT_DIR / "all_safe"
-            
-            # AND 模式
-            if and_mode_safe:
-                and_mode_dir = all_safe_base / "and_mode" / project_name
-                and_mode_dir.mkdir(parents=True, exist_ok=True)
-                and_mode_prompt = and_mode_dir / "prompt.txt"
-                with open(and_mode_prompt, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(and_mode_safe))
-                self.logger.info(f"  ✅ 已寫入: {and_mode_prompt}")
-            
-            # OR 模式/Bandit
-            if or_mode_bandit_safe:
-                or_bandit_dir = all_safe_base / "or_mode" / "bandit" / project_name
-                or_bandit_dir.mkdir(parents=True, exist_ok=True)
-                or_bandit_prompt = or_bandit_dir / "prompt.txt"
-                with open(or_bandit_prompt, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(or_mode_bandit_safe))
-                self.logger.info(f"  ✅ 已寫入: {or_bandit_prompt}")
-            
-            # OR 模式/Semgrep
-            if or_mode_semgrep_safe:
-                or_semgrep_dir = all_safe_base / "or_mode" / "semgrep" / project_name
-                or_semgrep_dir.mkdir(parents=True, exist_ok=True)
-                or_semgrep_prompt = or_semgrep_dir / "prompt.txt"
-                with open(or_semgrep_prompt, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(or_mode_semgrep_safe))
-                self.logger.info(f"  ✅ 已寫入: {or_semgrep_prompt}")
+            # AND 模式 / OR 模式-Bandit / OR 模式-Semgrep（以暫存檔原子替換寫入）
+            for safe_files, mode_base in zip(
+                (and_mode_safe, or_mode_bandit_safe, or_mode_semgrep_safe),
+                self._all_safe_mode_dirs
+            ):
+                if not safe_files:
+                    continue
+                mode_dir = mode_base / project_name
+                mode_dir.mkdir(parents=True, exist_ok=True)
+                mode_prompt = mode_dir / "prompt.txt"
+                _atomic_write_text(mode_prompt, '\n'.join(safe_files))
+                self.logger.info(f"  ✅ 已寫入: {mode_prompt}")
             
             return {
                 'and_mode': and_mode_safe,
@@ -548,53 +593,133 @@ class CWEScanManager:
             }
             
         except Exception as e:
-            import traceback
-            self.logger.error(f"生成 all_safe prompt 失敗: {e}\n{traceback.format_exc()}")
+            self.logger.error(f"生成 all_safe prompt 失敗: {e}", exc_info=True)
             return {'and_mode': [], 'or_mode_bandit': [], 'or_mode_semgrep': []}
     
-    def _check_bandit_report(self, report_file: Path, file_vulnerability_status: Dict[str, Dict[str, bool]]):
+    def _iter_round_reports(self, scanner_root: Path, round_names: List[str]) -> Iterator[Tuple[str, Path]]:
+        """
+        以 os.scandir 一次走訪掃描器專案目錄，列出指定輪次下的 *_report.json
+        
+        Args:
+            scanner_root: 掃描器專案目錄（如 Bandit/CWE-xxx/{project_name}）
+            round_names: 要納入的輪次資料夾名稱
+            
+        Yields:
+            Tuple[str, Path]: (輪次名稱, 報告檔案路徑)
+        """
+        wanted = set(round_names)
+        try:
+            with os.scandir(scanner_root) as entries:
+                round_entries = [e for e in entries if e.name in wanted and e.is_dir()]
+        except FileNotFoundError:
+            return
+        
+        for round_entry in round_entries:
+            with os.scandir(round_entry.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith('_report.json') and entry.is_file():
+                        yield round_entry.name, Path(entry.path)
+    
+    def _check_bandit_report(
+        self,
+        report_file: Path,
+        file_vulnerability_status: Dict[str, Dict[str, bool]],
+        basename_index: Optional[Dict[str, List[str]]] = None
+    ) -> List[str]:
         """
         檢查 Bandit 報告，更新檔案的漏洞狀態
+        
+        Returns:
+            List[str]: 本次新標記為已發現漏洞的檔案
         """
         try:
-            import json
-            with open(report_file, 'r', encoding='utf-8') as f:
-                report = json.load(f)
-            
-            # Bandit 報告的 results 陣列包含發現的漏洞
-            results = report.get('results', [])
-            if results:
-                # 從報告中找到對應的檔案路徑
-                for file_path in file_vulnerability_status.keys():
-                    # 檢查 results 中是否有該檔案的漏洞
-                    for result in results:
-                        result_filename = result.get('filename', '')
-                        if file_path in result_filename or result_filename.endswith(file_path):
-                            file_vulnerability_status[file_path]['bandit_found'] = True
-                            break
+            # Bandit 報告的 results 陣列包含發現的漏洞（路徑欄位為 filename）
+            return self._mark_report_results(
+                report_file, 'filename', 'bandit_found', file_vulnerability_status, basename_index
+            )
         except Exception as e:
             self.logger.debug(f"讀取 Bandit 報告失敗: {report_file}, 錯誤: {e}")
+            return []
     
-    def _check_semgrep_report(self, report_file: Path, file_vulnerability_status: Dict[str, Dict[str, bool]]):
+    def _check_semgrep_report(
+        self,
+        report_file: Path,
+        file_vulnerability_status: Dict[str, Dict[str, bool]],
+        basename_index: Optional[Dict[str, List[str]]] = None
+    ) -> List[str]:
         """
         檢查 Semgrep 報告，更新檔案的漏洞狀態
+        
+        Returns:
+            List[str]: 本次新標記為已發現漏洞的檔案
         """
         try:
-            import json
-            with open(report_file, 'r', encoding='utf-8') as f:
-                report = json.load(f)
-            
-            # Semgrep 報告的 results 陣列包含發現的漏洞
-            results = report.get('results', [])
-            if results:
-                for file_path in file_vulnerability_status.keys():
-                    for result in results:
-                        result_path = result.get('path', '')
-                        if file_path in result_path or result_path.endswith(file_path):
-                            file_vulnerability_status[file_path]['semgrep_found'] = True
-                            break
+            # Semgrep 報告的 results 陣列包含發現的漏洞（路徑欄位為 path）
+            return self._mark_report_results(
+                report_file, 'path', 'semgrep_found', file_vulnerability_status, basename_index
+            )
         except Exception as e:
             self.logger.debug(f"讀取 Semgrep 報告失敗: {report_file}, 錯誤: {e}")
+            return []
+    
+    @staticmethod
+    def _build_basename_index(file_paths) -> Dict[str, List[str]]:
+        """
+        建立 檔名 → 追蹤檔案路徑 的索引，供比對掃描結果時直接查表
+        
+        路徑分隔符統一為 '/'，同名檔案會放在同一個列表中。
+        """
+        basename_index: Dict[str, List[str]] = {}
+        for file_path in file_paths:
+            basename = file_path.replace('\\', '/').rsplit('/', 1)[-1]
+            basename_index.setdefault(basename, []).append(file_path)
+        return basename_index
+    
+    def _mark_report_results(
+        self,
+        report_file: Path,
+        path_key: str,
+        found_key: str,
+        file_vulnerability_status: Dict[str, Dict[str, bool]],
+        basename_index: Optional[Dict[str, List[str]]] = None
+    ) -> List[str]:
+        """
+        逐筆讀取報告的 results，將出現在結果中的檔案標記為已發現漏洞
+        
+        每筆結果以檔名查表取得候選檔案，再以路徑結尾確認；全部標記後即停止讀取。
+        有 ijson 時以串流方式解析，不需整份載入報告。
+        
+        Returns:
+            List[str]: 本次由未標記變為已標記的檔案
+        """
+        newly_found: List[str] = []
+        remaining = sum(1 for status in file_vulnerability_status.values() if not status[found_key])
+        if not remaining:
+            return newly_found
+        if basename_index is None:
+            basename_index = self._build_basename_index(file_vulnerability_status)
+        
+        with open(report_file, 'rb') as f:
+            if ijson is not None:
+                results = ijson.items(f, 'results.item')
+            else:
+                results = loads_json(f.read()).get('results', [])
+            
+            for result in results:
+                result_path = result.get(path_key, '')
+                if not result_path:
+                    continue
+                result_path = result_path.replace('\\', '/')
+                for file_path in basename_index.get(result_path.rsplit('/', 1)[-1], ()):
+                    status = file_vulnerability_status[file_path]
+                    if not status[found_key] and result_path.endswith(file_path.replace('\\', '/')):
+                        status[found_key] = True
+                        newly_found.append(file_path)
+                        remaining -= 1
+                if remaining <= 0:
+                    break
+        
+        return newly_found
 
 
 # 全域實例（預設 OR 模式）
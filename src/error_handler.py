@@ -14,7 +14,9 @@ from functools import wraps
 from enum import Enum
 
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 from config.config import config
 from src.logger import get_logger
 
@@ -9,11 +9,19 @@ import cv2
 import numpy as np
 import time
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, NamedTuple
 import sys
 
+# mss 為選用套件：可直接取得 BGRA 原始截圖，省去 PIL 轉換
+try:
+    import mss
+except ImportError:
+    mss = None
+
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 try:
     from config.config import config
     from src.logger import get_logger
@@ -27,6 +35,14 @@ except ImportError:
         import config
         from logger import get_logger
 
+class ImageBox(NamedTuple):
+    """圖像在螢幕上的位置（與 pyautogui 的 Box 欄位相同）"""
+    left: int
+    top: int
+    width: int
+    height: int
+
+
 class ImageRecognition:
     """圖像辨識處理器"""
     
@@ -34,8 +50,60 @@ class ImageRecognition:
         """初始化圖像辨識器"""
         self.logger = get_logger("ImageRecognition")
         self.screenshot_count = 0
+        self._sct = None  # mss 截圖實例（第一次截圖時建立）
+        self._templates = {}  # 模板路徑 → (修改時間, 解碼後的 BGR 陣列)
+        # 輪詢時反覆使用的按鈕模板路徑（只轉換一次字串）
+        self._stop_button_image = str(config.STOP_BUTTON_IMAGE)
+        self._send_button_image = str(config.SEND_BUTTON_IMAGE)
         self.logger.info("圖像辨識模組初始化完成")
     
+    def _load_template(self, template_path: Path, mtime_ns: int) -> Optional[np.ndarray]:
+        """
+        取得解碼後的模板圖像，同一檔案只解碼一次（檔案被重新截取時依修改時間重新載入）
+        
+        Args:
+            template_path: 模板圖像路徑
+            mtime_ns: 模板檔案目前的修改時間
+            
+        Returns:
+            Optional[np.ndarray]: BGR 模板陣列，無法讀取則返回 None
+        """
+        key = str(template_path)
+        cached = self._templates.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        template = cv2.imread(key, cv2.IMREAD_COLOR)
+        if template is not None:
+            self._templates[key] = (mtime_ns, template)
+        return template
+    
+    def _grab_screen_bgr(self, region: Tuple[int, int, int, int] = None) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        截取螢幕（或指定區域）為 BGR 陣列
+        
+        Args:
+            region: 截圖區域 (left, top, width, height)，None 表示主螢幕
+            
+        Returns:
+            Tuple[np.ndarray, Tuple[int, int]]: (BGR 截圖, 截圖左上角的螢幕座標)
+        """
+        if mss is not None:
+            if self._sct is None:
+                self._sct = mss.mss()
+            if region:
+                left, top, width, height = region
+                monitor = {"left": left, "top": top, "width": width, "height": height}
+            else:
+                monitor = self._sct.monitors[1]
+            # mss 回傳 BGRA，去掉 alpha 通道即為 OpenCV 使用的 BGR
+            shot = np.asarray(self._sct.grab(monitor))[:, :, :3]
+            return np.ascontiguousarray(shot), (monitor["left"], monitor["top"])
+        
+        screenshot = pyautogui.screenshot(region=region) if region else pyautogui.screenshot()
+        origin = (region[0], region[1]) if region else (0, 0)
+        return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR), origin
+    
     def take_screenshot(self, region: Tuple[int, int, int, int] = None, 
                        save_path: str = None) -> Optional[np.ndarray]:
         """
@@ -62,9 +130,11 @@ class ImageRecognition:
             # 如果指定了儲存路徑，儲存截圖
             if save_path:
                 cv2.imwrite(save_path, screenshot_cv)
-                self.logger.debug(f"截圖已儲存: {save_path}")
+                if self.logger.debug_enabled:
+                    self.logger.debug(f"截圖已儲存: {save_path}")
             
-            self.logger.debug(f"截圖完成 #{self.screenshot_count}")
+            if self.logger.debug_enabled:
+                self.logger.debug(f"截圖完成 #{self.screenshot_count}")
             return screenshot_cv
             
         except Exception as e:
@@ -86,31 +156,36 @@ class ImageRecognition:
         """
         try:
             template_path = Path(template_path)
-            if not template_path.exists():
+            try:
+                mtime_ns = template_path.stat().st_mtime_ns
+            except FileNotFoundError:
                 self.logger.error(f"模板圖像不存在: {template_path}")
                 return None
             
             if confidence is None:
                 confidence = config.IMAGE_CONFIDENCE
             
-            # 使用 pyautogui 的圖像識別功能
-            try:
-                location = pyautogui.locateOnScreen(
-                    str(template_path),
-                    confidence=confidence,
-                    region=region
-                )
-                
-                if location:
-                    self.logger.image_recognition(template_path.name, True, confidence)
-                    return location
-                else:
-                    self.logger.image_recognition(template_path.name, False)
-                    return None
-                    
-            except pyautogui.ImageNotFoundException:
+            template = self._load_template(template_path, mtime_ns)
+            if template is None:
+                self.logger.error(f"無法讀取模板圖像: {template_path}")
+                return None
+            
+            # 截圖一次後以 OpenCV matchTemplate 取得最佳匹配位置（與 pyautogui 的 confidence 比對方式相同）
+            haystack, (origin_x, origin_y) = self._grab_screen_bgr(region)
+            template_height, template_width = template.shape[:2]
+            if haystack.shape[0] < template_height or haystack.shape[1] < template_width:
                 self.logger.image_recognition(template_path.name, False)
                 return None
+            
+            result = cv2.matchTemplate(haystack, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            
+            if max_val >= confidence:
+                self.logger.image_recognition(template_path.name, True, max_val)
+                return ImageBox(origin_x + max_loc[0], origin_y + max_loc[1], template_width, template_height)
+            
+            self.logger.image_recognition(template_path.name, False)
+            return None
                 
         except Exception as e:
             self.logger.error(f"圖像識別過程中發生錯誤: {str(e)}")
@@ -150,7 +225,7 @@ class ImageRecognition:
                 
                 # 每10秒記錄一次等待狀態
                 elapsed = time.time() - start_time
-                if int(elapsed) % 10 == 0 and int(elapsed) > 0:
+                if int(elapsed) % 10 == 0 and int(elapsed) > 0 and self.logger.debug_enabled:
                     self.logger.debug(f"等待圖像 {template_name}... ({elapsed:.0f}秒)")
             
             self.logger.warning(f"⏰ 等待圖像 {template_name} 超時")
@@ -212,7 +287,7 @@ class ImageRecognition:
         try:
             # 第一步：檢查是否有 stop 按鈕（如果有，表示還在回應中）
             stop_button = self.find_image_on_screen(
-                str(config.STOP_BUTTON_IMAGE),
+                self._stop_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             
@@ -222,7 +297,7 @@ class ImageRecognition:
             
             # 第二步：檢查是否有 send 按鈕（stop 按鈕消失後應該出現 send 按鈕）
             send_button = self.find_image_on_screen(
-                str(config.SEND_BUTTON_IMAGE),
+                self._send_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             
@@ -257,14 +332,14 @@ class ImageRecognition:
             
             # 檢查 stop 按鈕
             stop_button = self.find_image_on_screen(
-                str(config.STOP_BUTTON_IMAGE),
+                self._stop_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             status['has_stop_button'] = bool(stop_button)
             
             # 檢查 send 按鈕
             send_button = self.find_image_on_screen(
-                str(config.SEND_BUTTON_IMAGE),
+                self._send_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             status['has_send_button'] = bool(send_button)
@@ -281,11 +356,11 @@ class ImageRecognition:
                     time.sleep(1.5)  # 增加等待時間
                     
                     stop_button = self.find_image_on_screen(
-                        str(config.STOP_BUTTON_IMAGE),
+                        self._stop_button_image,
                         confidence=config.IMAGE_CONFIDENCE
                     )
                     send_button = self.find_image_on_screen(
-                        str(config.SEND_BUTTON_IMAGE),
+                        self._send_button_image,
                         confidence=config.IMAGE_CONFIDENCE
                     )
                     
@@ -348,14 +423,14 @@ class ImageRecognition:
             
             # 檢查 stop 按鈕
             stop_button = self.find_image_on_screen(
-                str(config.STOP_BUTTON_IMAGE),
+                self._stop_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             status['has_stop_button'] = bool(stop_button)
             
             # 檢查 send 按鈕
             send_button = self.find_image_on_screen(
-                str(config.SEND_BUTTON_IMAGE),
+                self._send_button_image,
                 confidence=config.IMAGE_CONFIDENCE
             )
             status['has_send_button'] = bool(send_button)
@@ -381,11 +456,11 @@ class ImageRecognition:
                     time.sleep(1)  # 給一點時間讓 UI 更新
                     
                     stop_button = self.find_image_on_screen(
-                        str(config.STOP_BUTTON_IMAGE),
+                        self._stop_button_image,
                         confidence=config.IMAGE_CONFIDENCE
                     )
                     send_button = self.find_image_on_screen(
-                        str(config.SEND_BUTTON_IMAGE),
+                        self._send_button_image,
                         confidence=config.IMAGE_CONFIDENCE
                     )
                     
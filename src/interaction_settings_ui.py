@@ -11,7 +11,9 @@ import sys
 from pathlib import Path
 
 # 設定模組搜尋路徑
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 try:
     from config.config import config
 except ImportError:
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 讀寫共用函式
+有安裝 orjson 時使用 orjson 加速，否則退回標準 json
+"""
+
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads_json(data: bytes):
+    """解析 UTF-8 編碼的 JSON 內容"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json_file(json_file: Path):
+    """讀取 JSON 檔案"""
+    with open(json_file, 'rb') as f:
+        return loads_json(f.read())
+
+
+def write_json_file(json_file: Path, data):
+    """以縮排格式寫出 JSON 檔案；先寫暫存檔再以 os.replace 原子替換，避免留下被截斷的檔案"""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+    temp_file = json_file.with_name(json_file.name + '.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_file, json_file)
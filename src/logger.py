@@ -9,9 +9,13 @@ Hybrid UI Automation Script - 統一日誌系統模組
 4. 支援分隔線和結構化輸出
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -19,22 +23,86 @@ from typing import Optional
 _GLOBAL_LOG_FILE: Optional[Path] = None
 _GLOBAL_LOGGER: Optional[logging.Logger] = None
 _EXECUTION_START_TIME: Optional[datetime] = None
+# 背景寫入執行緒：呼叫端只把 LogRecord 放入佇列，實際的檔案／控制台輸出由 listener 處理
+_LOG_LISTENER: Optional[logging.handlers.QueueListener] = None
+_LOG_HANDLERS: tuple = ()
+# 帶有此標記的日誌（分隔線、批次摘要等里程碑）寫入後會立即寫出檔案緩衝區
+_FLUSH_EXTRA = {"flush_log": True}
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    緩衝寫入的檔案處理器
+    
+    一般日誌先累積在 64 KiB 的緩衝區中，避免每一行日誌都觸發一次 write 系統呼叫；
+    WARNING 以上的日誌與里程碑日誌寫入後立即寫出，flush() 與 close 也會正常寫出緩衝區
+    """
+    
+    BUFFER_SIZE = 64 * 1024
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord):
+        # 不沿用 StreamHandler.emit：它在每筆日誌後都會呼叫 flush()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING or getattr(record, "flush_log", False):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+# config 查詢結果快取：_CONFIG_UNSET 表示尚未查詢，None 表示無法匯入
+_CONFIG_UNSET = object()
+_CACHED_CONFIG = _CONFIG_UNSET
 
 
 def _get_config():
-    """安全地獲取 config，避免循環導入"""
-    try:
-        from config.config import config
-        return config
-    except ImportError:
-        return None
+    """安全地獲取 config，避免循環導入（結果只查詢一次）"""
+    global _CACHED_CONFIG
+    
+    if _CACHED_CONFIG is _CONFIG_UNSET:
+        try:
+            from config.config import config
+            _CACHED_CONFIG = config
+        except ImportError:
+            _CACHED_CONFIG = None
+    return _CACHED_CONFIG
+
+
+def _stop_log_listener():
+    """
+    停止背景寫入執行緒並寫出佇列中剩餘的日誌，之後改由處理器同步輸出
+    """
+    global _LOG_LISTENER
+    
+    if _LOG_LISTENER is None:
+        return
+    
+    _LOG_LISTENER.stop()
+    _LOG_LISTENER = None
+    
+    for handler in _LOG_HANDLERS:
+        if isinstance(handler, BufferedFileHandler):
+            handler.flush()
+    
+    # 停止後仍可能有日誌（例如其他 atexit 回呼），直接掛回實際處理器
+    _GLOBAL_LOGGER.handlers.clear()
+    for handler in _LOG_HANDLERS:
+        _GLOBAL_LOGGER.addHandler(handler)
 
 
 def _initialize_global_logger() -> logging.Logger:
     """
     初始化全域日誌記錄器（整個執行週期只執行一次）
     """
-    global _GLOBAL_LOG_FILE, _GLOBAL_LOGGER, _EXECUTION_START_TIME
+    global _GLOBAL_LOG_FILE, _GLOBAL_LOGGER, _EXECUTION_START_TIME, _LOG_LISTENER, _LOG_HANDLERS
     
     if _GLOBAL_LOGGER is not None:
         return _GLOBAL_LOGGER
@@ -65,17 +133,24 @@ def _initialize_global_logger() -> logging.Logger:
     # 設定格式器
     formatter = logging.Formatter(log_format)
     
-    # 檔案處理器（記錄所有級別）
-    file_handler = logging.FileHandler(_GLOBAL_LOG_FILE, encoding='utf-8')
+    # 檔案處理器（記錄所有級別，緩衝寫入）
+    file_handler = BufferedFileHandler(_GLOBAL_LOG_FILE, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    _GLOBAL_LOGGER.addHandler(file_handler)
     
     # 控制台處理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    _GLOBAL_LOGGER.addHandler(console_handler)
+    
+    # 日誌記錄器只掛 QueueHandler，檔案與控制台輸出交給背景 listener 執行緒
+    _LOG_HANDLERS = (file_handler, console_handler)
+    log_queue = queue.Queue(-1)
+    _GLOBAL_LOGGER.addHandler(logging.handlers.QueueHandler(log_queue))
+    _LOG_LISTENER = logging.handlers.QueueListener(log_queue, *_LOG_HANDLERS, respect_handler_level=True)
+    _LOG_LISTENER.start()
+    # 程式結束時確保佇列中的日誌都已寫出
+    atexit.register(_stop_log_listener)
     
     # 記錄啟動資訊
     _GLOBAL_LOGGER.info("=" * 70)
@@ -94,6 +169,8 @@ class AutomationLogger:
     所有模組共用同一個底層 logger，但各自標識模組名稱
     """
     
+    __slots__ = ("module_name", "_prefix", "_logger")
+    
     def __init__(self, module_name: str = "Main"):
         """
         初始化日誌記錄器
@@ -102,31 +179,33 @@ class AutomationLogger:
             module_name: 模組名稱（用於日誌中的標識）
         """
         self.module_name = module_name
+        self._prefix = module_name  # 模組標識，由 logging 在實際輸出時才組合進訊息
         self._logger = _initialize_global_logger()
     
-    def _format_message(self, message: str) -> str:
-        """格式化訊息，加入模組標識"""
-        return f"[{self.module_name}] {message}"
+    @property
+    def debug_enabled(self) -> bool:
+        """DEBUG 級別是否會被記錄（供呼叫端在組字串前先判斷）"""
+        return self._logger.isEnabledFor(logging.DEBUG)
     
     def debug(self, message: str):
         """記錄除錯訊息"""
-        self._logger.debug(self._format_message(message))
+        self._logger.debug("[%s] %s", self._prefix, message)
     
     def info(self, message: str):
         """記錄一般訊息"""
-        self._logger.info(self._format_message(message))
+        self._logger.info("[%s] %s", self._prefix, message)
     
     def warning(self, message: str):
         """記錄警告訊息"""
-        self._logger.warning(self._format_message(message))
+        self._logger.warning("[%s] %s", self._prefix, message)
     
-    def error(self, message: str):
-        """記錄錯誤訊息"""
-        self._logger.error(self._format_message(message))
+    def error(self, message: str, exc_info: bool = False):
+        """記錄錯誤訊息（exc_info=True 時由日誌處理器附上目前例外的 traceback）"""
+        self._logger.error("[%s] %s", self._prefix, message, exc_info=exc_info)
     
-    def critical(self, message: str):
-        """記錄嚴重錯誤訊息"""
-        self._logger.critical(self._format_message(message))
+    def critical(self, message: str, exc_info: bool = False):
+        """記錄嚴重錯誤訊息（exc_info=True 時由日誌處理器附上目前例外的 traceback）"""
+        self._logger.critical("[%s] %s", self._prefix, message, exc_info=exc_info)
     
     def log(self, message: str):
         """記錄一般訊息（info 的別名，相容舊 API）"""
@@ -142,24 +221,31 @@ class AutomationLogger:
     
     # ========== 結構化日誌方法 ==========
     
+    _PLAIN_SEPARATOR = "=" * 70
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _separator_line(title: str = "") -> str:
+        """產生分隔線文字（有標題時置中；依標題快取，重複標題不再重新組字串）"""
+        if not title:
+            return AutomationLogger._PLAIN_SEPARATOR
+        
+        # 計算填充
+        total_width = 70
+        title_with_space = f" {title} "
+        padding_total = total_width - len(title_with_space)
+        left_padding = padding_total // 2
+        right_padding = padding_total - left_padding
+        return "=" * left_padding + title_with_space + "=" * right_padding
+    
     def create_separator(self, title: str = ""):
         """創建分隔線"""
-        if title:
-            # 計算填充
-            total_width = 70
-            title_with_space = f" {title} "
-            padding_total = total_width - len(title_with_space)
-            left_padding = padding_total // 2
-            right_padding = padding_total - left_padding
-            separator = "=" * left_padding + title_with_space + "=" * right_padding
-        else:
-            separator = "=" * 70
-        self._logger.info(separator)
+        self._logger.info(self._separator_line(title), extra=_FLUSH_EXTRA)
     
     def project_start(self, project_name: str):
-        """記錄專案開始處理"""
-        self.create_separator(f"專案: {project_name}")
-        self.info(f"🚀 開始處理專案")
+        """記錄專案開始處理（分隔線與開始訊息合併為一筆日誌）"""
+        self._logger.info("%s\n[%s] %s", self._separator_line(f"專案: {project_name}"), self._prefix,
+                          "🚀 開始處理專案", extra=_FLUSH_EXTRA)
     
     def project_success(self, project_name: str, elapsed_time: float = None):
         """記錄專案處理成功"""
@@ -206,6 +292,8 @@ class AutomationLogger:
     
     def image_recognition(self, image_name: str, found: bool, confidence: float = 0.0):
         """記錄圖像識別結果"""
+        if not self.debug_enabled:
+            return
         if found:
             self.debug(f"🔍 圖像識別: {image_name} - 找到 (信心度: {confidence:.2f})")
         else:
@@ -218,12 +306,15 @@ class AutomationLogger:
     def batch_summary(self, total: int, success: int, failed: int, elapsed_time: float):
         """記錄批次處理摘要"""
         success_rate = (success / total * 100) if total > 0 else 0
-        self.create_separator("執行摘要")
-        self.info(f"📊 總專案數: {total}")
-        self.info(f"   ✅ 成功: {success}")
-        self.info(f"   ❌ 失敗: {failed}")
-        self.info(f"   📈 成功率: {success_rate:.1f}%")
-        self.info(f"   ⏱️  總耗時: {elapsed_time:.2f}秒")
+        # 分隔線與摘要內容合併為一筆日誌
+        summary = "\n".join([
+            f"📊 總專案數: {total}",
+            f"   ✅ 成功: {success}",
+            f"   ❌ 失敗: {failed}",
+            f"   📈 成功率: {success_rate:.1f}%",
+            f"   ⏱️  總耗時: {elapsed_time:.2f}秒",
+        ])
+        self._logger.info("%s\n[%s] %s", self._separator_line("執行摘要"), self._prefix, summary, extra=_FLUSH_EXTRA)
     
     def emergency_stop(self, reason: str):
         """記錄緊急停止"""
@@ -271,3 +362,6 @@ def finalize_logging():
         _GLOBAL_LOGGER.info(f"   總執行時間: {elapsed:.2f} 秒")
         _GLOBAL_LOGGER.info(f"   日誌檔案: {_GLOBAL_LOG_FILE}")
         _GLOBAL_LOGGER.info("=" * 70)
+    
+    # 寫出佇列中剩餘的日誌
+    _stop_log_listener()
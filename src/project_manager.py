@@ -6,6 +6,7 @@ Hybrid UI Automation Script - 專案管理模組
 
 import os
 import json
+from fnmatch import fnmatch
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
@@ -13,9 +14,13 @@ from datetime import datetime
 import sys
 
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 from config.config import config
 from src.logger import get_logger
+from src.json_compat import load_json_file, write_json_file
+
 
 @dataclass
 class ProjectInfo:
@@ -126,28 +131,26 @@ class ProjectManager:
         """
         try:
             project_name = project_path.name
-            supported_files = []
-            file_count = 0
-            
-            # 遞迴搜尋支援的檔案類型
-            for ext in self.SUPPORTED_EXTENSIONS:
-                files = list(project_path.rglob(f"*{ext}"))
-                if files:
-                    for file_path in files:
-                        supported_files.append(str(file_path.relative_to(project_path)))
-                    file_count += len(files)
+            # 單次遞迴走訪依副檔名分組，取代每種副檔名各走訪一次整個專案樹；
+            # 結果仍依 SUPPORTED_EXTENSIONS 的順序排列
+            files_by_ext = {ext: [] for ext in self.SUPPORTED_EXTENSIONS}
+            for dirpath, _, filenames in os.walk(project_path):
+                for filename in filenames:
+                    bucket = files_by_ext.get(os.path.splitext(filename)[1])
+                    if bucket is not None:
+                        bucket.append(os.path.relpath(os.path.join(dirpath, filename), project_path))
+            
+            supported_files = [path for paths in files_by_ext.values() for path in paths]
+            file_count = len(supported_files)
             
             # 分析專案專用提示詞
             prompt_info = self._analyze_project_prompt(project_path)
             
             # 檢查是否已有多輪互動處理結果（檢查統一的 output/ExecutionResult/Success 資料夾）
-            from config.config import config
-            execution_result_dir = config.EXECUTION_RESULT_DIR / "Success"
-            project_result_dir = execution_result_dir / project_name
+            project_result_dir = config.EXECUTION_RESULT_DIR / "Success" / project_name
             
-            # 只檢查多輪互動檔案格式
-            has_copilot_file = (project_result_dir.exists() and 
-                              any(project_result_dir.glob("*_第*輪.md")))
+            # 只檢查多輪互動檔案格式；glob 遇到不存在的目錄時直接回傳空結果，找到第一個即停止
+            has_copilot_file = any(project_result_dir.glob("*_第*輪.md"))
             
             # 如果沒有支援的檔案，跳過此專案
             if file_count == 0:
@@ -206,12 +209,13 @@ class ProjectManager:
                 
                 # 計算提示詞行數
                 try:
+                    # 逐行串流計數，不建立整份檔案的行列表
                     with open(prompt_file_path, 'r', encoding='utf-8') as f:
-                        lines = [line.strip() for line in f.readlines() if line.strip()]
-                    prompt_info["prompt_lines_count"] = len(lines)
+                        line_count = sum(1 for line in f if line.strip())
+                    prompt_info["prompt_lines_count"] = line_count
                     
                     self.logger.debug(f"專案 {project_path.name} 提示詞分析: "
-                                    f"{len(lines)} 行, {prompt_info['prompt_file_size']} bytes")
+                                    f"{line_count} 行, {prompt_info['prompt_file_size']} bytes")
                 except Exception as e:
                     self.logger.warning(f"讀取專案 {project_path.name} 提示詞檔案失敗: {str(e)}")
                     prompt_info["prompt_lines_count"] = 0
@@ -331,19 +335,22 @@ class ProjectManager:
             # 檢查多輪互動檔案格式（支援多種格式，包含子目錄）
             has_success_file = False
             has_files = 0
+            result_dir_exists = project_result_dir.is_dir()
             
-            if project_result_dir.exists():
-                # 遞迴檢查所有 .md 檔案
-                all_md_files = list(project_result_dir.rglob("*.md"))
-                # 檢查是否有符合命名規則的結果檔案（支援任意深度目錄結構）
+            if result_dir_exists:
+                # 單次遞迴走訪（os.walk 以 scandir 取得檔案類型）同時統計所有 .md 檔案，
+                # 並檢查是否有符合命名規則的結果檔案（支援任意深度目錄結構）
                 # 格式: *_第*行.md 或 *_第*輪.md 或 *_第*輪_第*行.md
-                result_files = list(project_result_dir.rglob("*_第*行.md")) + \
-                               list(project_result_dir.rglob("*_第*輪.md"))
-                
-                has_success_file = len(result_files) > 0
-                has_files = len(all_md_files)
-            
-            self.logger.info(f"結果檔案驗證 - 目錄存在: {project_result_dir.exists()}, "
+                for _, _, filenames in os.walk(project_result_dir):
+                    for filename in filenames:
+                        if not filename.endswith(".md"):
+                            continue
+                        has_files += 1
+                        if not has_success_file and (fnmatch(filename, "*_第*行.md") or
+                                                     fnmatch(filename, "*_第*輪.md")):
+                            has_success_file = True
+            
+            self.logger.info(f"結果檔案驗證 - 目錄存在: {result_dir_exists}, "
                              f"檔案數量: {has_files}, 多輪互動檔案: {has_success_file}")
             
             if has_success_file:
@@ -697,85 +704,58 @@ class ProjectManager:
             with open(json_file, 'w', encoding='utf-8') as f:
                 json.dump(report, f, ensure_ascii=False, indent=2)
             
-            # 保存 TXT（格式化輸出）
+            # 保存 TXT（格式化輸出）：先組合完整內容，再一次寫入
+            rule = "-" * 80 + "\n"
+            parts = ["=" * 80 + "\n",
+                     "自動化執行報告 | Automation Execution Report\n",
+                     "=" * 80 + "\n\n"]
+            
+            def add_section(title, rows):
+                parts.append(rule + title + "\n" + rule)
+                parts.extend(rows)
+                parts.append("\n")
+            
+            # 基本信息
+            parts.append(f"生成時間: {report['report_metadata']['生成時間']}\n")
+            parts.append(f"報告版本: {report['report_metadata']['報告版本']}\n\n")
+            
+            # 執行設定、執行摘要、檔案統計、運行時間
+            add_section("⚙️  執行設定",
+                        [f"{key:<25}: {value}\n" for key, value in report['execution_settings'].items()])
+            add_section("📊 執行摘要",
+                        [f"{key:<20}: {value}\n" for key, value in report['execution_summary'].items()])
+            add_section("📈 檔案處理統計",
+                        [f"{key:<20}: {value}\n" for key, value in report['file_statistics'].items()])
+            add_section("⏱️  運行時間",
+                        [f"{key:<20}: {value}\n" for key, value in report['performance_metrics'].items()])
+            
+            # 完整執行的專案
+            add_section(f"✅ 完整執行的專案 ({len(report['complete_projects'])} 個)",
+                        [f"{'專案名稱':<60} {'檔案數量':>10}\n", rule] +
+                        [f"{p['專案名稱']:<60} {p['檔案數量']:>10}\n" for p in report['complete_projects']])
+            
+            # 未完整執行的專案
+            if report['incomplete_projects']:
+                add_section(f"⚠️  未完整執行的專案 ({len(report['incomplete_projects'])} 個)",
+                            [f"{'專案名稱':<55} {'預期':>10} {'實際':>10}\n", rule] +
+                            [f"{p['專案名稱']:<55} {p['預期檔案數']:>10} {p['實際檔案數']:>10}\n"
+                             for p in report['incomplete_projects']])
+            
+            # 執行失敗的專案
+            if report['failed_projects']:
+                rows = [f"{'專案名稱':<55} {'預期':>10} {'實際':>10}\n", rule]
+                for p in report['failed_projects']:
+                    rows.append(f"{p['專案名稱']:<55} {p['預期檔案數']:>10} {p['實際檔案數']:>10}\n")
+                    if p['錯誤訊息']:
+                        rows.append(f"  錯誤: {p['錯誤訊息']}\n")
+                add_section(f"❌ 執行失敗的專案 ({len(report['failed_projects'])} 個)", rows)
+            
+            parts.append("=" * 80 + "\n")
+            parts.append("報告結束\n")
+            parts.append("=" * 80 + "\n")
+            
             with open(txt_file, 'w', encoding='utf-8') as f:
-                f.write("=" * 80 + "\n")
-                f.write("自動化執行報告 | Automation Execution Report\n")
-                f.write("=" * 80 + "\n\n")
-                
-                # 基本信息
-                f.write(f"生成時間: {report['report_metadata']['生成時間']}\n")
-                f.write(f"報告版本: {report['report_metadata']['報告版本']}\n\n")
-                
-                # 執行設定（新增）
-                f.write("-" * 80 + "\n")
-                f.write("⚙️  執行設定\n")
-                f.write("-" * 80 + "\n")
-                for key, value in report['execution_settings'].items():
-                    f.write(f"{key:<25}: {value}\n")
-                f.write("\n")
-                
-                # 執行摘要
-                f.write("-" * 80 + "\n")
-                f.write("📊 執行摘要\n")
-                f.write("-" * 80 + "\n")
-                for key, value in report['execution_summary'].items():
-                    f.write(f"{key:<20}: {value}\n")
-                f.write("\n")
-                
-                # 檔案統計
-                f.write("-" * 80 + "\n")
-                f.write("📈 檔案處理統計\n")
-                f.write("-" * 80 + "\n")
-                for key, value in report['file_statistics'].items():
-                    f.write(f"{key:<20}: {value}\n")
-                f.write("\n")
-                
-                # 運行時間
-                f.write("-" * 80 + "\n")
-                f.write("⏱️  運行時間\n")
-                f.write("-" * 80 + "\n")
-                for key, value in report['performance_metrics'].items():
-                    f.write(f"{key:<20}: {value}\n")
-                f.write("\n")
-                
-                # 完整執行的專案
-                f.write("-" * 80 + "\n")
-                f.write(f"✅ 完整執行的專案 ({len(report['complete_projects'])} 個)\n")
-                f.write("-" * 80 + "\n")
-                f.write(f"{'專案名稱':<60} {'檔案數量':>10}\n")
-                f.write("-" * 80 + "\n")
-                for p in report['complete_projects']:
-                    f.write(f"{p['專案名稱']:<60} {p['檔案數量']:>10}\n")
-                f.write("\n")
-                
-                # 未完整執行的專案
-                if report['incomplete_projects']:
-                    f.write("-" * 80 + "\n")
-                    f.write(f"⚠️  未完整執行的專案 ({len(report['incomplete_projects'])} 個)\n")
-                    f.write("-" * 80 + "\n")
-                    f.write(f"{'專案名稱':<55} {'預期':>10} {'實際':>10}\n")
-                    f.write("-" * 80 + "\n")
-                    for p in report['incomplete_projects']:
-                        f.write(f"{p['專案名稱']:<55} {p['預期檔案數']:>10} {p['實際檔案數']:>10}\n")
-                    f.write("\n")
-                
-                # 執行失敗的專案
-                if report['failed_projects']:
-                    f.write("-" * 80 + "\n")
-                    f.write(f"❌ 執行失敗的專案 ({len(report['failed_projects'])} 個)\n")
-                    f.write("-" * 80 + "\n")
-                    f.write(f"{'專案名稱':<55} {'預期':>10} {'實際':>10}\n")
-                    f.write("-" * 80 + "\n")
-                    for p in report['failed_projects']:
-                        f.write(f"{p['專案名稱']:<55} {p['預期檔案數']:>10} {p['實際檔案數']:>10}\n")
-                        if p['錯誤訊息']:
-                            f.write(f"  錯誤: {p['錯誤訊息']}\n")
-                    f.write("\n")
-                
-                f.write("=" * 80 + "\n")
-                f.write("報告結束\n")
-                f.write("=" * 80 + "\n")
+                f.write("".join(parts))
             
             self.logger.info(f"摘要報告已儲存:")
             self.logger.info(f"  JSON: {json_file}")
@@ -794,8 +774,8 @@ class ProjectManager:
                 "projects": [project.to_dict() for project in self.projects]
             }
             
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(status_data, f, ensure_ascii=False, indent=2)
+            # 原子寫入，中斷時不會留下被截斷的狀態檔
+            write_json_file(self.status_file, status_data)
                 
         except Exception as e:
             self.logger.error(f"儲存狀態檔案失敗: {str(e)}")
@@ -804,8 +784,7 @@ class ProjectManager:
         """從檔案載入專案狀態"""
         try:
             if self.status_file.exists():
-                with open(self.status_file, 'r', encoding='utf-8') as f:
-                    status_data = json.load(f)
+                status_data = load_json_file(self.status_file)
                 
                 # 合併已載入的狀態
                 saved_projects = {p["name"]: ProjectInfo.from_dict(p) 
@@ -1,16 +1,37 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
+import os
 import subprocess
 from pathlib import Path
 import sys
 import threading
 
 # 設定模組搜尋路徑
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 
 from config.config import config
 from src.settings_manager import settings_manager
 
+
+def _directory_size(root: Path) -> int:
+    """
+    以 os.scandir 單次走訪累計目錄下所有檔案大小
+    檔案/目錄判斷取自目錄項目類型，每個檔案只需一次 stat
+    """
+    total = 0
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    total += entry.stat().st_size
+    return total
+
+
 class UIManager:
     """UI 管理器 - 提供簡單的選項選擇介面"""
     
@@ -455,7 +476,7 @@ class UIManager:
                 if success_dir.exists():
                     try:
                         # 計算大小
-                        dir_size = sum(f.stat().st_size for f in success_dir.rglob('*') if f.is_file())
+                        dir_size = _directory_size(success_dir)
                         total_size += dir_size
                         
                         shutil.rmtree(success_dir)
@@ -514,7 +535,7 @@ class UIManager:
                         if project_dir.exists():
                             try:
                                 # 計算大小
-                                dir_size = sum(f.stat().st_size for f in project_dir.rglob('*') if f.is_file())
+                                dir_size = _directory_size(project_dir)
                                 total_size += dir_size
                                 
                                 shutil.rmtree(project_dir)
@@ -555,7 +576,7 @@ class UIManager:
                         if bandit_dir.exists():
                             try:
                                 # 計算大小
-                                dir_size = sum(f.stat().st_size for f in bandit_dir.rglob('*') if f.is_file())
+                                dir_size = _directory_size(bandit_dir)
                                 total_size += dir_size
                                 
                                 shutil.rmtree(bandit_dir)
@@ -569,7 +590,7 @@ class UIManager:
                         if semgrep_dir.exists():
                             try:
                                 # 計算大小
-                                dir_size = sum(f.stat().st_size for f in semgrep_dir.rglob('*') if f.is_file())
+                                dir_size = _directory_size(semgrep_dir)
                                 total_size += dir_size
                                 
                                 shutil.rmtree(semgrep_dir)
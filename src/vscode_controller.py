@@ -4,16 +4,20 @@ Hybrid UI Automation Script - VS Code 操作控制模組
 處理開啟專案、關閉專案、記憶清除等 VS Code 操作
 """
 
+import atexit
 import subprocess
 import time
 import os
-import pyautogui
+import re
+import shutil
 from pathlib import Path
 from typing import Optional
 import sys
 
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 try:
     from config.config import config
     from src.logger import get_logger
@@ -27,15 +31,79 @@ except ImportError:
         import config
         from logger import get_logger
 
+# pyautogui 延遲到第一次送出按鍵時才載入（會連帶載入 PIL、pyscreeze 等模組）
+pyautogui = None
+
+
+def _pyautogui():
+    """取得 pyautogui 模組（第一次呼叫時才匯入）"""
+    global pyautogui
+    if pyautogui is None:
+        import pyautogui as _module
+        pyautogui = _module
+    return pyautogui
+
+# 子程序輸出導向的 /dev/null（模組載入時開啟一次，所有 Popen/run 共用）
+_DEVNULL_FD = os.open(os.devnull, os.O_WRONLY)
+atexit.register(os.close, _DEVNULL_FD)
+
 class VSCodeController:
     """VS Code 操作控制器 - 簡化版本"""
     
+    # 開啟專案時固定附加的 VS Code 啟動參數
+    _VSCODE_FLAGS = ("--disable-gpu-sandbox", "--no-sandbox", "--disable-dev-shm-usage")
+    
     def __init__(self):
         """初始化 VS Code 控制器"""
         self.logger = get_logger("VSCodeController")
         self.current_project_path = None
+        self._xdotool = shutil.which("xdotool")  # 用於偵測視窗是否出現；未安裝時退回固定等待
+        if not self._xdotool:
+            self.logger.warning("⚠️ 未找到 xdotool，開啟/關閉專案時將改用固定等待（sudo apt-get install -y xdotool）")
         self.logger.info("VS Code 控制器初始化完成")
     
+    @staticmethod
+    def _send_hotkey(*keys: str):
+        """
+        送出快捷鍵（依序按下、反向放開）
+        
+        每個呼叫點之後都有明確的等待時間，因此略過 pyautogui 在每次操作後加入的 PAUSE 延遲
+        """
+        _pyautogui().hotkey(*keys, _pause=False)
+    
+    def _wait_for_vscode_window(self, project_name: str, timeout: float, present: bool = True,
+                                poll_interval: float = 0.25) -> bool:
+        """
+        等待專案的 VS Code 視窗出現（或消失），最多等待 timeout 秒
+        
+        Args:
+            project_name: 專案資料夾名稱（VS Code 視窗標題中的 rootName）
+            timeout: 最長等待時間（秒）
+            present: True 等待視窗出現，False 等待視窗消失
+            poll_interval: 檢查間隔（秒）
+            
+        Returns:
+            bool: 是否在時限內達到預期狀態（未安裝 xdotool 時固定等待後返回 False）
+        """
+        if not self._xdotool:
+            time.sleep(timeout)
+            return False
+        
+        title_pattern = f"{re.escape(project_name)}.*Visual Studio Code"
+        deadline = time.monotonic() + timeout
+        while True:
+            found = subprocess.run(
+                [self._xdotool, "search", "--onlyvisible", "--name", title_pattern],
+                stdout=_DEVNULL_FD,
+                stderr=_DEVNULL_FD
+            ).returncode == 0
+            if found == present:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+    
     def open_project(self, project_path: str, wait_for_load: bool = True) -> bool:
         """
         開啟專案
@@ -57,31 +125,27 @@ class VSCodeController:
             self.logger.info(f"開啟專案: {project_path}")
             
             # 使用命令列開啟專案
-            cmd = [
-                config.VSCODE_EXECUTABLE, 
-                str(project_path),
-                "--disable-gpu-sandbox",
-                "--no-sandbox",
-                "--disable-dev-shm-usage"
-            ]
+            cmd = [config.VSCODE_EXECUTABLE, str(project_path), *self._VSCODE_FLAGS]
             
             subprocess.Popen(
                 cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
+                stdout=_DEVNULL_FD,
+                stderr=_DEVNULL_FD
             )
             
             self.current_project_path = str(project_path)
             
             if wait_for_load:
-                self.logger.info(f"等待 VS Code 載入 ({config.VSCODE_STARTUP_DELAY}秒)...")
-                time.sleep(config.VSCODE_STARTUP_DELAY)
+                self.logger.info(f"等待 VS Code 載入 (最多 {config.VSCODE_STARTUP_DELAY}秒)...")
+                start_time = time.monotonic()
+                if self._wait_for_vscode_window(project_path.name, config.VSCODE_STARTUP_DELAY):
+                    # 視窗出現時 Copilot Chat 等擴充套件仍在載入，固定保留一段穩定時間
+                    time.sleep(config.VSCODE_EXTENSION_SETTLE_DELAY)
+                    self.logger.info(f"VS Code 視窗已就緒 (耗時: {time.monotonic() - start_time:.1f}秒)")
                 
                 # 最大化視窗
                 self.logger.info("最大化視窗...")
-                pyautogui.keyDown('win')
-                pyautogui.press('up')
-                pyautogui.keyUp('win')
+                self._send_hotkey('win', 'up')
                 time.sleep(0.5)
             
             self.logger.info(f"✅ 專案開啟成功: {project_path.name}")
@@ -101,9 +165,12 @@ class VSCodeController:
         try:
             self.logger.info("關閉當前專案視窗...")
             
-            # 使用 Alt+F4 關閉當前視窗
-            pyautogui.hotkey('alt', 'f4')
-            time.sleep(1)
+            # 使用 Alt+F4 關閉當前視窗，等待視窗消失（最多 1 秒）
+            self._send_hotkey('alt', 'f4')
+            if self.current_project_path:
+                self._wait_for_vscode_window(Path(self.current_project_path).name, 1, present=False)
+            else:
+                time.sleep(1)
             
             self.current_project_path = None
             self.logger.info("✅ 當前專案視窗關閉")
@@ -152,7 +219,7 @@ class VSCodeController:
             self.logger.info(f"修改結果處理模式: {modification_action}")
             
             # 1. 開啟 Copilot Chat (Ctrl+F1)
-            pyautogui.hotkey('ctrl', 'f1')
+            self._send_hotkey('ctrl', 'f1')
             self.logger.debug("執行快捷鍵: Ctrl+F1 (開啟 Copilot Chat)")
             time.sleep(2)
             
@@ -160,22 +227,22 @@ class VSCodeController:
             if modification_action == "revert":
                 # Undo: Ctrl+Backspace → Enter
                 self.logger.info("執行復原修改操作: Ctrl+Backspace → Enter")
-                pyautogui.hotkey('ctrl', 'backspace')
+                self._send_hotkey('ctrl', 'backspace')
                 time.sleep(2)
-                pyautogui.press('enter')
+                self._send_hotkey('enter')
                 time.sleep(1)
                 self.logger.info("✅ 已執行復原修改操作")
             elif modification_action == "keep":
                 # Keep: Ctrl+Enter
                 self.logger.info("執行保留修改操作: Ctrl+Enter")
-                pyautogui.hotkey('ctrl', 'enter')
+                self._send_hotkey('ctrl', 'enter')
                 time.sleep(1)
                 self.logger.info("✅ 已執行保留修改操作")
             else:
                 self.logger.warning(f"⚠️ 未知的處理行為: {modification_action}，跳過 undo/keep 操作")
             
             # 3. 清除對話歷史 (Ctrl+L)
-            pyautogui.hotkey('ctrl', 'l')
+            self._send_hotkey('ctrl', 'l')
             self.logger.debug("執行快捷鍵: Ctrl+L (清除對話歷史)")
             time.sleep(1)
             
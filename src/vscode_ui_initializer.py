@@ -11,7 +11,9 @@ from pathlib import Path
 from typing import List, Dict, Any
 
 # 導入配置和日誌
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 try:
     from config.config import config
     from src.logger import get_logger
@@ -5,21 +5,31 @@
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # 添加專案根目錄到 Python 路徑
-sys.path.append(str(Path(__file__).parent.parent))
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 
 from src.copilot_handler import CopilotHandler
 from src.logger import get_logger
 
+
+@lru_cache(maxsize=1)
+def _get_handler():
+    """所有測試共用同一個 CopilotHandler 實例"""
+    return CopilotHandler()
+
+
 def test_parse_prompt_line():
     """測試 prompt 行解析功能（純路徑格式）"""
     print("=" * 60)
     print("測試 1: Prompt 行解析功能（純路徑格式）")
     print("=" * 60)
     
-    handler = CopilotHandler()
+    handler = _get_handler()
     
     test_cases = [
         ("src/crypto/encryption.py", "src/crypto/encryption.py"),
@@ -45,7 +55,7 @@ def test_apply_template():
     print("測試 2: 模板套用功能")
     print("=" * 60)
     
-    handler = CopilotHandler()
+    handler = _get_handler()
     
     test_cases = [
         "src/crypto/encryption.py",
@@ -74,7 +84,7 @@ def test_end_to_end():
     print("測試 3: 端對端流程")
     print("=" * 60)
     
-    handler = CopilotHandler()
+    handler = _get_handler()
     
     prompt_line = "src/crypto/encryption.py"
     